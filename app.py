@@ -1,22 +1,29 @@
-from flask import Flask, render_template, request, jsonify, session, make_response
+from flask import Flask, render_template, request, jsonify, session, Response, send_file
+from werkzeug.wsgi import FileWrapper
 import csv
 import io
 import re
 from datetime import datetime
 import traceback
-import chardet
+import orjson
 import os
 import uuid
 import tempfile
 import logging
-from collections import Counter
 import json
+import sys
+import time
+import secrets
+import hashlib
+import threading
+from collections import OrderedDict
+from itertools import islice
 
 
 from validator_registry import validator_registry
 from validators_common import *
-from data_processor import data_processor
-from parallel_validator import validate_single_row, enhance_error_with_value
+from data_processor import data_processor, detect_sample_encoding, POOLED_CODE_COLUMNS
+from parallel_validator import validate_columns, validation_error, enhance_error_with_value, PHONE_FIELDS, ZIP_FIELDS
 
 app = Flask(__name__)
 app.config['MAX_CONTENT_LENGTH'] = 2048 * 1024 * 1024 
@@ -47,6 +54,70 @@ cleanup_old_files()
 
 ALLOWED_EXTENSIONS = {'csv'}
 
+CODE_POOL_MAX_SIZE = 10000
+_code_pool = {}
+
+def pool_code(value):
+    """Return the shared instance of a low-cardinality code value"""
+    pooled = _code_pool.get(value)
+    if pooled is None:
+        if len(_code_pool) >= CODE_POOL_MAX_SIZE:
+            return value
+        pooled = _code_pool.setdefault(value, value)
+    return pooled
+
+USER_STATE_TTL = 3600
+USER_STATE_SWEEP_INTERVAL = 600
+_user_state = {}
+_user_state_last_used = {}
+_user_state_lock = threading.Lock()
+
+def get_user_state(create=False):
+    """
+    Look up the server-side state (current file, settings, errors file) of the client
+    
+    The client identifies itself with the X-Validation-Token header, falling back to the
+    token kept in the session, so the session cookie only ever carries the token.
+    
+    Args:
+        create: Start a new state if the client has no live token
+        
+    Returns:
+        Tuple of (token, state dict), or (None, None) if there is no state
+    """
+    token = request.headers.get('X-Validation-Token') or session.get('validation_token')
+    
+    with _user_state_lock:
+        state = _user_state.get(token) if token else None
+        if state is None:
+            if not create:
+                return None, None
+            token = secrets.token_urlsafe(16)
+            state = {}
+            _user_state[token] = state
+        _user_state_last_used[token] = time.monotonic()
+    
+    if session.get('validation_token') != token:
+        session['validation_token'] = token
+    return token, state
+
+def sweep_user_state():
+    """Drop state not used within USER_STATE_TTL and schedule the next sweep"""
+    cutoff = time.monotonic() - USER_STATE_TTL
+    with _user_state_lock:
+        expired = [token for token, last_used in _user_state_last_used.items() if last_used < cutoff]
+        for token in expired:
+            _user_state.pop(token, None)
+            _user_state_last_used.pop(token, None)
+    if expired:
+        app.logger.debug(f"Dropped {len(expired)} expired validation states")
+    
+    timer = threading.Timer(USER_STATE_SWEEP_INTERVAL, sweep_user_state)
+    timer.daemon = True
+    timer.start()
+
+sweep_user_state()
+
 REGULATIONS = {
     "CO": {
         "name": "Columbia",
@@ -131,8 +202,8 @@ def detect_delimiter(sample):
 
 def detect_encoding(file_content):
     """Detect the encoding of file content"""
-    result = chardet.detect(file_content)
-    return result['encoding'] or 'utf-8'
+    encoding, _ = detect_sample_encoding(file_content)
+    return encoding or 'utf-8'
 
 def detect_enclosure(file_content, delimiter=',', sample_lines=5):
     """
@@ -337,7 +408,117 @@ def check_duplicate_idcardnos(data):
     
     return duplicate_idcardnos
 
+def detailed_error_record(row_number, error):
+    """Convert a structured validation error into the record exported in the errors CSV"""
+    return {
+        'row_number': row_number,
+        'code': error['code'],
+        'field_name': error['field'],
+        'error_type': error['error_type'],
+        'error_message': error['message'],
+        'invalid_value': error['value']
+    }
+
+ERRORS_FILE_BUFFER_SIZE = 1 << 20
+DOWNLOAD_BATCH_SIZE = 1000
+
+def write_errors_csv(errors_file_path, csv_path):
+    """
+    Convert a JSONL errors file into the CSV offered for download
+    
+    Args:
+        errors_file_path: Path to the JSONL file with one error record per line
+        csv_path: Path of the CSV file to create
+    """
+    tmp_path = f"{csv_path}.tmp"
+    with open(errors_file_path, 'rb', buffering=ERRORS_FILE_BUFFER_SIZE) as errors_jsonl, \
+            open(tmp_path, 'w', encoding='utf-8', newline='', buffering=ERRORS_FILE_BUFFER_SIZE) as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow([
+            'Row Number',
+            'Code', 
+            'Field Name',
+            'Error Type',
+            'Invalid Value',
+            'Full Error Message'
+        ])
+        while True:
+            lines = list(islice(errors_jsonl, DOWNLOAD_BATCH_SIZE))
+            if not lines:
+                break
+            writer.writerows(
+                (error['row_number'], error['code'], error['field_name'],
+                 error['error_type'], error['invalid_value'], error['error_message'])
+                for error in map(orjson.loads, lines)
+            )
+    os.replace(tmp_path, csv_path)
 
+VALIDATION_SETUP_CACHE_SIZE = 128
+_setup_cache = OrderedDict()
+_setup_cache_lock = threading.Lock()
+
+def build_validation_setup(fieldnames, required_columns, column_mappings, regulation_name):
+    """
+    Resolve the parts of a validation run that only depend on the file header and settings
+    
+    Args:
+        fieldnames: Header row of the uploaded CSV file
+        required_columns: List of columns to validate
+        column_mappings: Mapping of CSV headers to expected field names
+        regulation_name: Name of the selected regulation (or None)
+        
+    Returns:
+        Dictionary with the header plan and the regulation-specific validators
+    """
+    required_columns_lower = frozenset(sys.intern(col.lower()) for col in required_columns)
+    
+    column_mappings_lower = {}
+    for csv_header, expected_field in column_mappings.items():
+        if csv_header is not None:
+            column_mappings_lower.setdefault(csv_header.lower(), expected_field)
+    
+    header_plan = {field: column_mappings_lower.get(field.lower(), field) for field in fieldnames}
+    mapped_header = [sys.intern(header_plan[field]) if header_plan[field] else header_plan[field]
+                     for field in fieldnames]
+    
+    regulation = validator_registry.resolve_regulation(regulation_name)
+    personalid_validator = regulation['personalid']
+    personalid_conditional = bool(personalid_validator) and regulation['personalid_conditional']
+    personalid_depends_on = regulation['personalid_depends_on'] if personalid_conditional else None
+    
+    return {
+        'all_columns': [col.strip() for col in fieldnames],
+        'mapped_header': mapped_header,
+        'validated_fields': [(field, sys.intern(field.lower())) for field in dict.fromkeys(mapped_header)
+                             if field and field.lower() in required_columns_lower],
+        'pooled_positions': [position for position, mapped_field in enumerate(mapped_header)
+                             if mapped_field and mapped_field.lower() in POOLED_CODE_COLUMNS],
+        'personalid_validator': personalid_validator,
+        'personalid_conditional': personalid_conditional,
+        'personalid_depends_on': personalid_depends_on,
+        'zip_validator': regulation['zip'],
+        'document_validator': regulation['documents'] if regulation_name else None
+    }
+
+def get_validation_setup(file_path, fieldnames, regulation_key, required_columns, column_mappings, regulation_name):
+    """Return the validation setup for a file and settings, reusing a recently built one"""
+    settings = json.dumps({'required_columns': required_columns, 'column_mappings': column_mappings}, sort_keys=True)
+    cache_key = (file_path, regulation_key, hashlib.md5(settings.encode('utf-8')).hexdigest())
+    
+    with _setup_cache_lock:
+        setup = _setup_cache.get(cache_key)
+        if setup is not None:
+            _setup_cache.move_to_end(cache_key)
+            return setup
+    
+    setup = build_validation_setup(fieldnames, required_columns, column_mappings, regulation_name)
+    
+    with _setup_cache_lock:
+        _setup_cache[cache_key] = setup
+        if len(_setup_cache) > VALIDATION_SETUP_CACHE_SIZE:
+            _setup_cache.popitem(last=False)
+    
+    return setup
 
 @app.route('/')
 def index():
@@ -357,10 +538,11 @@ def get_regulations():
 @app.route('/file-info', methods=['GET'])
 def get_file_info():
     """Get information about the uploaded file including memory estimates"""
-    if 'current_file' not in session:
+    _, state = get_user_state()
+    if state is None or 'current_file' not in state:
         return jsonify({'error': 'No file has been uploaded'}), 400
     
-    file_info = session['current_file']
+    file_info = state['current_file']
     file_path = file_info['path']
     
     if not os.path.exists(file_path):
@@ -460,6 +642,8 @@ def upload_file():
         
         app.logger.debug(f"CSV columns found: {columns}")
         
+        validation_token, state = get_user_state(create=True)
+        
         required_columns = []
         if 'required_columns' in request.form:
             required_columns_input = request.form['required_columns']
@@ -477,7 +661,7 @@ def upload_file():
             
             app.logger.info(f"Required columns parsed: {required_columns}")
             
-            session['required_columns'] = required_columns
+            state['required_columns'] = required_columns
 
         column_mappings = {}
         if 'column_mappings' in request.form:
@@ -490,7 +674,7 @@ def upload_file():
             except json.JSONDecodeError:
                 app.logger.warning(f"Failed to parse column mappings: {mappings_input}")
         
-        session['column_mappings'] = column_mappings
+        state['column_mappings'] = column_mappings
         
         cleaned_columns = []
         for col in columns:
@@ -532,7 +716,7 @@ def upload_file():
             for _ in f:
                 row_count += 1
         
-        session['current_file'] = {
+        state['current_file'] = {
             'id': file_id,
             'path': temp_file_path,
             'rows': row_count,
@@ -547,7 +731,6 @@ def upload_file():
             preview_info = data_processor.get_file_preview(temp_file_path, n_rows=10)
             preview_data = preview_info['preview_data']
             row_count = preview_info['total_rows']
-            detected_columns = preview_info['columns']
             
             if preview_info['file_info']:
                 encoding = preview_info['file_info']['encoding']
@@ -575,7 +758,8 @@ def upload_file():
             'detected_delimiter': delimiter,
             'detected_encoding': encoding,
             'detected_enclosure': enclosure,
-            'column_mappings': column_mappings
+            'column_mappings': column_mappings,
+            'validation_token': validation_token
         })
         
     except Exception as e:
@@ -589,15 +773,18 @@ def validate_optimized():
     try:
         app.logger.info("Starting optimized validation")
         
-        if 'current_file' not in session:
+        validation_token, state = get_user_state()
+        if state is None or 'current_file' not in state:
             return jsonify({'error': 'No file has been uploaded. Please upload a file first.'}), 400
         
-        file_info = session['current_file']
+        file_info = state['current_file']
         file_path = file_info['path']
         
         if not os.path.exists(file_path):
             return jsonify({'error': 'File no longer exists. Please upload again.'}), 400
         
+        clear_validator_caches()
+        
         selected_regulation = None
         if request.json and 'regulation' in request.json:
             regulation_key = request.json['regulation']
@@ -610,7 +797,7 @@ def validate_optimized():
         elif request.json and 'required_columns' in request.json:
             required_columns = request.json['required_columns']
         else:
-            required_columns = session.get('required_columns', [])
+            required_columns = state.get('required_columns', [])
         
         if not required_columns:
             required_columns = ['code', 'firstname', 'lastname', 'email',
@@ -622,7 +809,7 @@ def validate_optimized():
         if request.json and 'column_mappings' in request.json:
             column_mappings = request.json['column_mappings']
         else:
-            column_mappings = session.get('column_mappings', {})
+            column_mappings = state.get('column_mappings', {})
         
         memory_info = data_processor.get_memory_usage_estimate(file_path)
         app.logger.info(f"Memory estimate: {memory_info}")
@@ -643,64 +830,44 @@ def validate_optimized():
         }
         
         try:
+            errors_file_id = str(uuid.uuid4())
+            errors_file_path = os.path.join(TEMP_FOLDER, f"errors_{errors_file_id}.jsonl")
+            results_file_path = os.path.join(TEMP_FOLDER, f"results_{errors_file_id}.jsonl")
+            
             validation_results = data_processor.validate_dataframe_parallel(
                 df=df,
-                validation_func=validate_single_row,
+                validation_func=validate_columns,
                 required_columns=required_columns,
-                regulation_info=regulation_info
+                regulation_info=regulation_info,
+                results_path=results_file_path,
+                sample_size=100
             )
             
             app.logger.info(f"Parallel validation completed: {validation_results['total_rows']} rows processed")
             
-            detailed_errors = []
-            all_results = validation_results.get('results', [])
-            for result in all_results:
-                if not result['valid']:
-                    for error in result['errors']:
-                        error_parts = error.split(': ', 2)
-                        if len(error_parts) >= 2:
-                            code_field = error_parts[0]
-                            error_message = ': '.join(error_parts[1:])
-                            
-                            code_field_parts = code_field.rsplit(' ', 1)
-                            if len(code_field_parts) == 2:
-                                field_name = code_field_parts[1]
-                            else:
-                                field_name = "unknown"
-                            
-                            actual_value = ""
-                            if "': '" in error_message and error_message.endswith("'"):
-                                value_start = error_message.rfind(": '") + 3
-                                value_end = error_message.rfind("'")
-                                actual_value = error_message[value_start:value_end]
-                                error_type = error_message[:error_message.rfind(": '")]
-                            else:
-                                error_type = error_message
-                                actual_value = ""
-                            
-                            detailed_errors.append({
-                                'row_number': result['row'],
-                                'code': result['code'],
-                                'field_name': field_name,
-                                'error_type': error_type,
-                                'error_message': error_message,
-                                'invalid_value': actual_value
-                            })
+            errors_written = 0
             
-            if detailed_errors:
-                errors_file_id = str(uuid.uuid4())
-                errors_file_path = os.path.join(TEMP_FOLDER, f"errors_{errors_file_id}.json")
-                
-                with open(errors_file_path, 'w', encoding='utf-8') as f:
-                    json.dump(detailed_errors, f, ensure_ascii=False, indent=2)
-                
-                session['errors_file_id'] = errors_file_id
+            try:
+                with open(results_file_path, 'rb') as results_jsonl, \
+                        open(errors_file_path, 'wb', buffering=ERRORS_FILE_BUFFER_SIZE) as errors_jsonl:
+                    for line in results_jsonl:
+                        result = orjson.loads(line)
+                        for error in result['errors']:
+                            errors_jsonl.write(orjson.dumps(detailed_error_record(result['row'], error),
+                                                            option=orjson.OPT_APPEND_NEWLINE))
+                        errors_written += len(result['errors'])
+            finally:
+                os.remove(results_file_path)
+            
+            if errors_written:
+                state['errors_file_id'] = errors_file_id
             else:
-                session.pop('errors_file_id', None)
+                os.remove(errors_file_path)
+                state.pop('errors_file_id', None)
             
-            limited_results = validation_results.copy()
-            limited_results['results'] = validation_results['results'][:100]
-            limited_results['has_errors_for_download'] = len(detailed_errors) > 0
+            limited_results = validation_results
+            limited_results['has_errors_for_download'] = errors_written > 0
+            limited_results['validation_token'] = validation_token
             
             return jsonify(limited_results)
             
@@ -716,59 +883,49 @@ def validate_optimized():
 def download_errors():
     """Download validation errors as CSV file"""
     try:
-        if 'errors_file_id' not in session:
+        _, state = get_user_state()
+        if state is None or 'errors_file_id' not in state:
             return jsonify({'error': 'No validation errors available for download'}), 400
         
-        errors_file_id = session['errors_file_id']
-        errors_file_path = os.path.join(TEMP_FOLDER, f"errors_{errors_file_id}.json")
-        
-        if not os.path.exists(errors_file_path):
-            return jsonify({'error': 'Validation errors file no longer exists'}), 400
-        
-        try:
-            with open(errors_file_path, 'r', encoding='utf-8') as f:
-                detailed_errors = json.load(f)
-        except Exception as e:
-            app.logger.error(f"Error reading errors file: {str(e)}")
-            return jsonify({'error': 'Error reading validation errors'}), 500
-        
-        if not detailed_errors:
-            return jsonify({'error': 'No validation errors to download'}), 400
-        
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        writer.writerow([
-            'Row Number',
-            'Code', 
-            'Field Name',
-            'Error Type',
-            'Invalid Value',
-            'Full Error Message'
-        ])
-        
-        for error in detailed_errors:
-            writer.writerow([
-                error['row_number'],
-                error['code'],
-                error['field_name'],
-                error['error_type'],
-                error['invalid_value'],
-                error['error_message']
-            ])
-        
-        csv_content = output.getvalue()
-        output.close()
+        errors_file_id = state['errors_file_id']
+        errors_file_path = os.path.join(TEMP_FOLDER, f"errors_{errors_file_id}.jsonl")
+        errors_csv_path = os.path.join(TEMP_FOLDER, f"errors_{errors_file_id}.csv")
         
-        response = make_response(csv_content)
-        response.headers['Content-Type'] = 'text/csv'
-        response.headers['Content-Disposition'] = f'attachment; filename=validation_errors_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
-        
-        try:
-            os.remove(errors_file_path)
-            session.pop('errors_file_id', None)
-        except Exception as e:
-            app.logger.warning(f"Could not remove errors file: {str(e)}")
+        if not os.path.exists(errors_csv_path):
+            if not os.path.exists(errors_file_path):
+                return jsonify({'error': 'Validation errors file no longer exists'}), 400
+            
+            if os.path.getsize(errors_file_path) == 0:
+                return jsonify({'error': 'No validation errors to download'}), 400
+            
+            write_errors_csv(errors_file_path, errors_csv_path)
+        
+        state.pop('errors_file_id', None)
+        download_name = f'validation_errors_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
+        
+        accel_redirect_prefix = app.config.get('ERRORS_ACCEL_REDIRECT_PREFIX')
+        if accel_redirect_prefix:
+            return Response(mimetype='text/csv', headers={
+                'Content-Disposition': f'attachment; filename={download_name}',
+                'X-Accel-Redirect': f"{accel_redirect_prefix.rstrip('/')}/{os.path.basename(errors_csv_path)}"
+            })
+        
+        response = send_file(errors_csv_path, mimetype='text/csv', as_attachment=True,
+                             download_name=download_name, conditional=True)
+        
+        # Servers without wsgi.file_wrapper (no sendfile) get Werkzeug's 8 KiB read loop;
+        # read the file in 1 MiB pieces instead
+        if isinstance(response.response, FileWrapper):
+            response.response.buffer_size = ERRORS_FILE_BUFFER_SIZE
+        
+        # send_file has already opened the CSV, so the files can go now; with X-Sendfile
+        # the web server still needs the path and cleanup_old_files removes them later
+        if not app.config['USE_X_SENDFILE']:
+            for path in (errors_csv_path, errors_file_path):
+                try:
+                    os.remove(path)
+                except Exception as e:
+                    app.logger.warning(f"Could not remove errors file: {str(e)}")
         
         return response
         
@@ -780,28 +937,37 @@ def download_errors():
 def validate():
     """Validate data from the stored file - only checking specified columns"""
     try:
-        app.logger.debug(f"Session keys at validation start: {list(session.keys())}")
-        app.logger.debug(f"Required columns from session: {session.get('required_columns', [])}")
-        
-        if 'current_file' not in session:
+        validation_token, state = get_user_state()
+        if state is None or 'current_file' not in state:
             return jsonify({'error': 'No file has been uploaded. Please upload a file first.'}), 400
         
-        file_info = session['current_file']
+        file_info = state['current_file']
         file_path = file_info['path']
         
+        app.logger.debug(f"Validation state keys at validation start: {list(state.keys())}")
+        app.logger.debug(f"Required columns from state: {state.get('required_columns', [])}")
+        
         if not os.path.exists(file_path):
             return jsonify({'error': 'File no longer exists. Please upload again.'}), 400
         
-        error_counter = Counter()
+        clear_validator_caches()
+        
+        error_counter = {}
+        
+        def count_error(key):
+            error_counter[key] = error_counter.get(key, 0) + 1
         
         chunk_size = 5000  
         
         def read_csv_in_chunks(file_path, delimiter, chunk_size):
             with open(file_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f, delimiter=delimiter)
+                reader = csv.reader(f, delimiter=delimiter)
+                yield next(reader, None)
                 chunk = []
-                for i, row in enumerate(reader):
-                    chunk.append(row)
+                for values in reader:
+                    if not values:
+                        continue
+                    chunk.append(values)
                     if len(chunk) >= chunk_size:
                         yield chunk
                         chunk = []
@@ -809,6 +975,7 @@ def validate():
                     yield chunk
 
         selected_regulation = None
+        regulation_key = None
         if request.json and 'regulation' in request.json:
             regulation_key = request.json['regulation']
             if regulation_key in REGULATIONS:
@@ -817,23 +984,21 @@ def validate():
         
         if selected_regulation:
             required_columns = selected_regulation.get('required_fields', [])
-            session['required_columns'] = required_columns
+            state['required_columns'] = required_columns
             app.logger.info(f"Using regulation-specific required columns: {required_columns}")
         elif request.json and 'required_columns' in request.json:
             required_columns = request.json['required_columns']
-            session['required_columns'] = required_columns
+            state['required_columns'] = required_columns
             app.logger.info(f"Using required columns from request: {required_columns}")
         else:
-            required_columns = session.get('required_columns', [])
-            app.logger.info(f"Using required columns from session: {required_columns}")
+            required_columns = state.get('required_columns', [])
+            app.logger.info(f"Using required columns from validation state: {required_columns}")
         
         if not required_columns:
             required_columns = ['code', 'firstname', 'lastname', 'email',
                             'birthdate', 'address', 'city', 'phone', 'cellphone',
                             'countrycode', 'signuplanguagecode', 'currencycode','username', 'zip', 'signupdate', 'password']
         
-        required_columns_lower = [col.lower() for col in required_columns]
-        
         app.logger.info(f"Validating ONLY these columns: {required_columns}")
         
         column_mappings = {}
@@ -841,33 +1006,34 @@ def validate():
             try:
                 column_mappings = request.json['column_mappings']
                 app.logger.info(f"Using column mappings from request: {column_mappings}")
-                session['column_mappings'] = column_mappings
+                state['column_mappings'] = column_mappings
             except Exception as e:
                 app.logger.error(f"Error processing column mappings from request: {str(e)}")
-                column_mappings = session.get('column_mappings', {})
-                app.logger.info(f"Falling back to session column mappings: {column_mappings}")
+                column_mappings = state.get('column_mappings', {})
+                app.logger.info(f"Falling back to stored column mappings: {column_mappings}")
         else:
-            column_mappings = session.get('column_mappings', {})
-            app.logger.info(f"Using column mappings from session: {column_mappings}")
-        
-        def should_validate(column_name):
-            if column_name is None:
-                return False
-            return column_name.lower() in required_columns_lower
-        
-        def map_column_name(original_name):
-            if original_name is None:
-                return original_name
-            for csv_header, expected_field in column_mappings.items():
-                if csv_header is None:
-                    continue
-                if original_name.lower() == csv_header.lower():
-                    return expected_field
-            return original_name
-        
-        with open(file_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f, delimiter=file_info['delimiter'])
-            all_columns = [col.strip() for col in reader.fieldnames]
+            column_mappings = state.get('column_mappings', {})
+            app.logger.info(f"Using column mappings from validation state: {column_mappings}")
+        
+        regulation_name = selected_regulation.get('name') if selected_regulation else None
+        
+        csv_chunks = read_csv_in_chunks(file_path, file_info['delimiter'], chunk_size)
+        fieldnames = next(csv_chunks)
+        
+        setup = get_validation_setup(file_path, fieldnames, regulation_key,
+                                     required_columns, column_mappings, regulation_name)
+        all_columns = setup['all_columns']
+        mapped_header = setup['mapped_header']
+        header_length = len(mapped_header)
+        validated_fields = setup['validated_fields']
+        pooled_positions = setup['pooled_positions']
+        
+        personalid_validator = setup['personalid_validator']
+        personalid_conditional = setup['personalid_conditional']
+        personalid_depends_on = setup['personalid_depends_on']
+        zip_validator = setup['zip_validator']
+        
+        document_validator = setup['document_validator']
         
         email_indices = {}
         duplicate_emails = {}
@@ -878,338 +1044,323 @@ def validate():
         idcardno_indices = {}
         duplicate_idcardnos = {}
         
-        validation_results = []
+        valid_rows = 0
+        invalid_rows = 0
+        preview_results = []
+        errors_written = 0
         row_idx = 0
-        
-        for chunk in read_csv_in_chunks(file_path, file_info['delimiter'], chunk_size):
-            mapped_chunk = []
-            for original_row in chunk:
-                mapped_row = {}
-                for key, value in original_row.items():
-                    mapped_key = map_column_name(key)
-                    mapped_row[mapped_key] = value
-                mapped_chunk.append(mapped_row)
-            
-            for i, row in enumerate(mapped_chunk):
-                current_idx = row_idx + i
-                
-                if 'email' in row and row['email']:
-                    email = str(row['email']).strip().lower()
-                    if email in email_indices:
-                        if email not in duplicate_emails:
-                            duplicate_emails[email] = [email_indices[email]]
-                        duplicate_emails[email].append(current_idx)
-                    else:
-                        email_indices[email] = current_idx
-                
-                if 'username' in row and row['username']:
-                    username = str(row['username']).strip().lower()
-                    if username in username_indices:
-                        if username not in duplicate_usernames:
-                            duplicate_usernames[username] = [username_indices[username]]
-                        duplicate_usernames[username].append(current_idx)
-                    else:
-                        username_indices[username] = current_idx
-                
-                if 'personalid' in row and row['personalid']:
-                    personalid = str(row['personalid']).strip()
-                    if personalid in personalid_indices:
-                        if personalid not in duplicate_personalids:
-                            duplicate_personalids[personalid] = [personalid_indices[personalid]]
-                        duplicate_personalids[personalid].append(current_idx)
-                    else:
-                        personalid_indices[personalid] = current_idx
-                
-                if 'idcardno' in row and row['idcardno']:
-                    idcardno = str(row['idcardno']).strip()
-                    if idcardno in idcardno_indices:
-                        if idcardno not in duplicate_idcardnos:
-                            duplicate_idcardnos[idcardno] = [idcardno_indices[idcardno]]
-                        duplicate_idcardnos[idcardno].append(current_idx)
-                    else:
-                        idcardno_indices[idcardno] = current_idx
+
+        errors_file_id = str(uuid.uuid4())
+        errors_file_path = os.path.join(TEMP_FOLDER, f"errors_{errors_file_id}.jsonl")
+
+        with open(errors_file_path, 'wb', buffering=ERRORS_FILE_BUFFER_SIZE) as errors_jsonl:
+            for chunk in csv_chunks:
+                mapped_chunk = []
+                for values in chunk:
+                    if len(values) < header_length:
+                        values.extend([None] * (header_length - len(values)))
+                    for position in pooled_positions:
+                        if values[position]:
+                            values[position] = pool_code(values[position])
+                    mapped_chunk.append(dict(zip(mapped_header, values)))
             
-            for i, row in enumerate(mapped_chunk):
-                current_idx = row_idx + i
-                row_errors = []
-                is_valid = True
-                code_value = row.get('code', 'N/A')
+                for i, row in enumerate(mapped_chunk):
+                    current_idx = row_idx + i
+                    row_errors = []
+                    is_valid = True
+                    code_value = row.get('code', 'N/A')
                 
-                if 'email' in row and row['email']:
-                    email = str(row['email']).strip().lower()
-                    if email in duplicate_emails:
-                        if duplicate_emails[email][0] != current_idx:
-                            error_msg = f"Duplicate email: {email} (also in row {duplicate_emails[email][0] + 1})"
-                            row_errors.append(f"{code_value} {error_msg}")
-                            error_counter["Duplicate email"] += 1
+                    if 'email' in row and row['email']:
+                        email = sys.intern(str(row['email']).strip().lower())
+                        first_idx = email_indices.get(email)
+                        if first_idx is None:
+                            email_indices[email] = current_idx
+                        else:
+                            if email in duplicate_emails:
+                                duplicate_emails[email].append(current_idx)
+                            else:
+                                duplicate_emails[email] = [first_idx, current_idx]
+                            error_msg = f"Duplicate email: {email} (also in row {first_idx + 1})"
+                            row_errors.append(validation_error(code_value, 'email', "Duplicate email", error_msg, email))
+                            count_error("Duplicate email")
                             is_valid = False
                 
-                if 'username' in row and row['username']:
-                    username = str(row['username']).strip().lower()
-                    if username in duplicate_usernames:
-                        if duplicate_usernames[username][0] != current_idx:
-                            error_msg = f"Duplicate username: {username} (also in row {duplicate_usernames[username][0] + 1})"
-                            row_errors.append(f"{code_value} {error_msg}")
-                            error_counter["Duplicate username"] += 1
+                    if 'username' in row and row['username']:
+                        username = sys.intern(str(row['username']).strip().lower())
+                        first_idx = username_indices.get(username)
+                        if first_idx is None:
+                            username_indices[username] = current_idx
+                        else:
+                            if username in duplicate_usernames:
+                                duplicate_usernames[username].append(current_idx)
+                            else:
+                                duplicate_usernames[username] = [first_idx, current_idx]
+                            error_msg = f"Duplicate username: {username} (also in row {first_idx + 1})"
+                            row_errors.append(validation_error(code_value, 'username', "Duplicate username", error_msg, username))
+                            count_error("Duplicate username")
                             is_valid = False
                 
-                if 'personalid' in row and row['personalid']:
-                    personalid = str(row['personalid']).strip()
-                    if personalid in duplicate_personalids:
-                        if duplicate_personalids[personalid][0] != current_idx:
-                            error_msg = f"Duplicate personal ID: {personalid} (also in row {duplicate_personalids[personalid][0] + 1})"
-                            row_errors.append(f"{code_value} {error_msg}")
-                            error_counter["Duplicate personal ID"] += 1
+                    if 'personalid' in row and row['personalid']:
+                        personalid = sys.intern(str(row['personalid']).strip())
+                        first_idx = personalid_indices.get(personalid)
+                        if first_idx is None:
+                            personalid_indices[personalid] = current_idx
+                        else:
+                            if personalid in duplicate_personalids:
+                                duplicate_personalids[personalid].append(current_idx)
+                            else:
+                                duplicate_personalids[personalid] = [first_idx, current_idx]
+                            error_msg = f"Duplicate personal ID: {personalid} (also in row {first_idx + 1})"
+                            row_errors.append(validation_error(code_value, 'personalid', "Duplicate personal ID", error_msg, personalid))
+                            count_error("Duplicate personal ID")
                             is_valid = False
                 
-                if 'idcardno' in row and row['idcardno']:
-                    idcardno = str(row['idcardno']).strip()
-                    if idcardno in duplicate_idcardnos:
-                        if duplicate_idcardnos[idcardno][0] != current_idx:
-                            error_msg = f"Duplicate ID card number: {idcardno} (also in row {duplicate_idcardnos[idcardno][0] + 1})"
-                            row_errors.append(f"{code_value} {error_msg}")
-                            error_counter["Duplicate ID card number"] += 1
+                    if 'idcardno' in row and row['idcardno']:
+                        idcardno = sys.intern(str(row['idcardno']).strip())
+                        first_idx = idcardno_indices.get(idcardno)
+                        if first_idx is None:
+                            idcardno_indices[idcardno] = current_idx
+                        else:
+                            if idcardno in duplicate_idcardnos:
+                                duplicate_idcardnos[idcardno].append(current_idx)
+                            else:
+                                duplicate_idcardnos[idcardno] = [first_idx, current_idx]
+                            error_msg = f"Duplicate ID card number: {idcardno} (also in row {first_idx + 1})"
+                            row_errors.append(validation_error(code_value, 'idcardno', "Duplicate ID card number", error_msg, idcardno))
+                            count_error("Duplicate ID card number")
                             is_valid = False
                 
-                for field in row.keys():
-                    if field is None or not should_validate(field):
-                        continue
-                    
-                    value = row[field]
-                    if (field.lower() == 'personalid' and 
-                        selected_regulation and selected_regulation.get('name') == 'Peru'):
-                        citizenship = row.get('citizenship', '')
-                        if str(citizenship).strip().upper() == 'ES' and not str(value).strip():
-                            error_msg = f"{field} is required for Spanish residents"
-                            row_errors.append(f"{code_value} {error_msg}")
-                            error_counter[error_msg] += 1
+                    for field, field_lower in validated_fields:
+                        value = row[field]
+                        value_str = str(value).strip()
+                        if (field_lower == 'personalid' and 
+                            selected_regulation and selected_regulation.get('name') == 'Peru'):
+                            citizenship = row.get('citizenship', '')
+                            if not value_str and str(citizenship).strip().upper() == 'ES':
+                                error_msg = f"{field} is required for Spanish residents"
+                                row_errors.append(validation_error(code_value, field, error_msg, error_msg, value))
+                                count_error(error_msg)
+                                is_valid = False
+                                continue
+                            elif not value_str:
+                                continue
+                        elif not value_str:
+                            error_msg = f"{field} is required but missing"
+                            row_errors.append(validation_error(code_value, field, error_msg, error_msg, value))
+                            count_error(error_msg)
                             is_valid = False
                             continue
-                        elif not str(value).strip():
-                            continue
-                    elif not str(value).strip():
-                        error_msg = f"{field} is required but missing"
-                        row_errors.append(f"{code_value} {error_msg}")
-                        error_counter[error_msg] += 1
-                        is_valid = False
-                        continue
-                    
-                    field_lower = field.lower() if field is not None else ""
                     
-                    if field_lower == 'email':
-                        email_error = enhanced_email_validation(value)
-                        if email_error:
-                            generic_error = email_error
-                            enhanced_error = enhance_error_with_value(email_error, 'email', value)
-                            row_errors.append(f"{code_value} {enhanced_error}")
-                            error_counter[generic_error] += 1
-                            is_valid = False
+                        if field_lower == 'email':
+                            email_error = enhanced_email_validation(value)
+                            if email_error:
+                                generic_error = email_error
+                                enhanced_error = enhance_error_with_value(email_error, 'email', value)
+                                row_errors.append(validation_error(code_value, field, generic_error, enhanced_error, value))
+                                count_error(generic_error)
+                                is_valid = False
                     
-                    elif field_lower == 'birthdate':
-                        birthdate_error = is_invalid_birthdate(value)
-                        if birthdate_error:
-                            error_msg = "Invalid birthdate"
-                            detailed_error = f"Birthdate: {birthdate_error}"
-                            row_errors.append(f"{code_value} {error_msg}")
-                            error_counter[detailed_error] += 1
-                            is_valid = False
+                        elif field_lower == 'birthdate':
+                            birthdate_error = is_invalid_birthdate(value)
+                            if birthdate_error:
+                                error_msg = "Invalid birthdate"
+                                detailed_error = f"Birthdate: {birthdate_error}"
+                                row_errors.append(validation_error(code_value, field, detailed_error, error_msg, value))
+                                count_error(detailed_error)
+                                is_valid = False
                     
-                    elif field_lower in ['phone', 'cellphone']:
-                        phone_error = validate_phone_number(value)
-                        if phone_error:
-                            generic_error = f"{field}: {phone_error}"
-                            enhanced_error = f"{field}: {enhance_error_with_value(phone_error, field, value)}"
-                            row_errors.append(f"{code_value} {enhanced_error}")
-                            error_counter[generic_error] += 1
-                            is_valid = False
+                        elif field_lower in PHONE_FIELDS:
+                            phone_error = validate_phone_number(value)
+                            if phone_error:
+                                generic_error = f"{field}: {phone_error}"
+                                enhanced_error = f"{field}: {enhance_error_with_value(phone_error, field, value)}"
+                                row_errors.append(validation_error(code_value, field, generic_error, enhanced_error, value))
+                                count_error(generic_error)
+                                is_valid = False
                     
-                    elif field_lower == 'firstname':
-                        name_error = validate_name(value)
-                        if name_error:
-                            generic_error = name_error
-                            enhanced_error = enhance_error_with_value(name_error, 'firstname', value)
-                            row_errors.append(f"{code_value} firstname: {enhanced_error}")
-                            error_counter[generic_error] += 1
-                            is_valid = False
+                        elif field_lower == 'firstname':
+                            name_error = validate_name(value)
+                            if name_error:
+                                generic_error = name_error
+                                enhanced_error = enhance_error_with_value(name_error, 'firstname', value)
+                                row_errors.append(validation_error(code_value, field, generic_error, f"firstname: {enhanced_error}", value))
+                                count_error(generic_error)
+                                is_valid = False
                         
-                        length_error = validate_name_length(value, 1, 50)
-                        if length_error:
-                            generic_error = length_error
-                            enhanced_error = enhance_error_with_value(length_error, 'firstname', value)
-                            row_errors.append(f"{code_value} firstname: {enhanced_error}")
-                            error_counter[generic_error] += 1
-                            is_valid = False
+                            length_error = validate_name_length(value, 1, 50)
+                            if length_error:
+                                generic_error = length_error
+                                enhanced_error = enhance_error_with_value(length_error, 'firstname', value)
+                                row_errors.append(validation_error(code_value, field, generic_error, f"firstname: {enhanced_error}", value))
+                                count_error(generic_error)
+                                is_valid = False
 
-                    elif field_lower == 'regioncode':
-                        regioncode_error = validate_regioncode(value)
-                        if regioncode_error:
-                            error_msg = f"regioncode: {regioncode_error}"
-                            row_errors.append(f"{code_value} {error_msg}")
-                            error_counter[error_msg] += 1
-                            is_valid = False
+                        elif field_lower == 'regioncode':
+                            regioncode_error = validate_regioncode(value)
+                            if regioncode_error:
+                                error_msg = f"regioncode: {regioncode_error}"
+                                row_errors.append(validation_error(code_value, field, error_msg, error_msg, value))
+                                count_error(error_msg)
+                                is_valid = False
 
-                    elif field_lower == 'provincecode':
-                        provincecode_error = validate_provincecode(value)
-                        if provincecode_error:
-                            error_msg = f"provincecode: {provincecode_error}"
-                            row_errors.append(f"{code_value} {error_msg}")
-                            error_counter[error_msg] += 1
-                            is_valid = False
+                        elif field_lower == 'provincecode':
+                            provincecode_error = validate_provincecode(value)
+                            if provincecode_error:
+                                error_msg = f"provincecode: {provincecode_error}"
+                                row_errors.append(validation_error(code_value, field, error_msg, error_msg, value))
+                                count_error(error_msg)
+                                is_valid = False
 
-                    elif field_lower == 'province':
-                        province_error = validate_province(value)
-                        if province_error:
-                            error_msg = f"province: {province_error}"
-                            row_errors.append(f"{code_value} {error_msg}")
-                            error_counter[error_msg] += 1
-                            is_valid = False
+                        elif field_lower == 'province':
+                            province_error = validate_province(value)
+                            if province_error:
+                                error_msg = f"province: {province_error}"
+                                row_errors.append(validation_error(code_value, field, error_msg, error_msg, value))
+                                count_error(error_msg)
+                                is_valid = False
 
-                    elif field_lower == 'personalid':
-                        regulation_name = selected_regulation.get('name') if selected_regulation else None
-                        personalid_validator = validator_registry.get_validator(regulation_name, 'personalid')
-                        
-                        if personalid_validator:
-                            conditional_info = validator_registry.has_conditional_validation(regulation_name, 'personalid')
-                            if conditional_info and conditional_info.get('conditional'):
-                                depends_on = conditional_info.get('depends_on')
-                                dependency_value = row.get(depends_on, '') if depends_on else ''
-                                personalid_error = personalid_validator(value, dependency_value)
+                        elif field_lower == 'personalid':
+                            if personalid_validator:
+                                if personalid_conditional:
+                                    dependency_value = row.get(personalid_depends_on, '') if personalid_depends_on else ''
+                                    personalid_error = personalid_validator(value, dependency_value)
+                                else:
+                                    personalid_error = personalid_validator(value)
                             else:
-                                personalid_error = personalid_validator(value)
-                        else:
-                            personalid_error = validate_personalid(value)
+                                personalid_error = validate_personalid(value)
                         
-                        if personalid_error:
-                            generic_error = f"personalid: {personalid_error}"
-                            enhanced_error = f"personalid: {enhance_error_with_value(personalid_error, 'personalid', value)}"
-                            row_errors.append(f"{code_value} {enhanced_error}")
-                            error_counter[generic_error] += 1
-                            is_valid = False
+                            if personalid_error:
+                                generic_error = f"personalid: {personalid_error}"
+                                enhanced_error = f"personalid: {enhance_error_with_value(personalid_error, 'personalid', value)}"
+                                row_errors.append(validation_error(code_value, field, generic_error, enhanced_error, value))
+                                count_error(generic_error)
+                                is_valid = False
 
-                    elif field_lower == 'idcardno':
-                        idcardno_error = validate_idcardno(value)
-                        if idcardno_error:
-                            generic_error = f"idcardno: {idcardno_error}"
-                            enhanced_error = f"idcardno: {enhance_error_with_value(idcardno_error, 'idcardno', value)}"
-                            row_errors.append(f"{code_value} {enhanced_error}")
-                            error_counter[generic_error] += 1
-                            is_valid = False
+                        elif field_lower == 'idcardno':
+                            idcardno_error = validate_idcardno(value)
+                            if idcardno_error:
+                                generic_error = f"idcardno: {idcardno_error}"
+                                enhanced_error = f"idcardno: {enhance_error_with_value(idcardno_error, 'idcardno', value)}"
+                                row_errors.append(validation_error(code_value, field, generic_error, enhanced_error, value))
+                                count_error(generic_error)
+                                is_valid = False
 
-                    elif field_lower == 'citizenship':
-                        citizenship_error = validate_citizenship(value)
-                        if citizenship_error:
-                            error_msg = f"citizenship: {citizenship_error}"
-                            row_errors.append(f"{code_value} {error_msg}")
-                            error_counter[error_msg] += 1
-                            is_valid = False
+                        elif field_lower == 'citizenship':
+                            citizenship_error = validate_citizenship(value)
+                            if citizenship_error:
+                                error_msg = f"citizenship: {citizenship_error}"
+                                row_errors.append(validation_error(code_value, field, error_msg, error_msg, value))
+                                count_error(error_msg)
+                                is_valid = False
 
-                    elif field_lower == 'signupdate':
-                        signup_date_error = validate_signup_date(value)
-                        if signup_date_error:
-                            error_msg = f"signupdate: {signup_date_error}"
-                            row_errors.append(f"{code_value} {error_msg}")
-                            error_counter[error_msg] += 1
-                            is_valid = False
+                        elif field_lower == 'signupdate':
+                            signup_date_error = validate_signup_date(value)
+                            if signup_date_error:
+                                error_msg = f"signupdate: {signup_date_error}"
+                                row_errors.append(validation_error(code_value, field, error_msg, error_msg, value))
+                                count_error(error_msg)
+                                is_valid = False
                     
-                    elif field_lower == 'lastname':
-                        name_error = validate_name(value)
-                        if name_error:
-                            generic_error = name_error
-                            enhanced_error = enhance_error_with_value(name_error, 'lastname', value)
-                            row_errors.append(f"{code_value} lastname: {enhanced_error}")
-                            error_counter[generic_error] += 1
-                            is_valid = False
+                        elif field_lower == 'lastname':
+                            name_error = validate_name(value)
+                            if name_error:
+                                generic_error = name_error
+                                enhanced_error = enhance_error_with_value(name_error, 'lastname', value)
+                                row_errors.append(validation_error(code_value, field, generic_error, f"lastname: {enhanced_error}", value))
+                                count_error(generic_error)
+                                is_valid = False
                         
-                        length_error = validate_name_length(value, 1, 50)
-                        if length_error:
-                            generic_error = length_error
-                            enhanced_error = enhance_error_with_value(length_error, 'lastname', value)
-                            row_errors.append(f"{code_value} lastname: {enhanced_error}")
-                            error_counter[generic_error] += 1
-                            is_valid = False
+                            length_error = validate_name_length(value, 1, 50)
+                            if length_error:
+                                generic_error = length_error
+                                enhanced_error = enhance_error_with_value(length_error, 'lastname', value)
+                                row_errors.append(validation_error(code_value, field, generic_error, f"lastname: {enhanced_error}", value))
+                                count_error(generic_error)
+                                is_valid = False
                     
-                    elif field_lower == 'address':
-                        crlf_error = check_for_crlf(value)
-                        if crlf_error:
-                            error_msg = f"address: {crlf_error}"
-                            row_errors.append(f"{code_value} {error_msg}")
-                            error_counter[error_msg] += 1
-                            is_valid = False
+                        elif field_lower == 'address':
+                            crlf_error = check_for_crlf(value)
+                            if crlf_error:
+                                error_msg = f"address: {crlf_error}"
+                                row_errors.append(validation_error(code_value, field, error_msg, error_msg, value))
+                                count_error(error_msg)
+                                is_valid = False
                     
-                    elif field_lower == 'countrycode':
-                        country_error = validate_country_code(value)
-                        if country_error:
-                            error_msg = f"countrycode: {country_error}"
-                            row_errors.append(f"{code_value} {error_msg}")
-                            error_counter[error_msg] += 1
-                            is_valid = False
+                        elif field_lower == 'countrycode':
+                            country_error = validate_country_code(value)
+                            if country_error:
+                                error_msg = f"countrycode: {country_error}"
+                                row_errors.append(validation_error(code_value, field, error_msg, error_msg, value))
+                                count_error(error_msg)
+                                is_valid = False
 
-                    elif field_lower in ['zipcode', 'postalcode', 'zip', 'postcode']:
-                        regulation_name = selected_regulation.get('name') if selected_regulation else None
-                        zip_validator = validator_registry.get_validator(regulation_name, 'zip')
-                        
-                        if zip_validator:
-                            zip_error = zip_validator(value)
-                        else:
-                            zip_error = validate_zip_code(value)
+                        elif field_lower in ZIP_FIELDS:
+                            if zip_validator:
+                                zip_error = zip_validator(value)
+                            else:
+                                zip_error = validate_zip_code(value)
                         
-                        if zip_error:
-                            error_msg = f"{field}: {zip_error}"
-                            row_errors.append(f"{code_value} {error_msg}")
-                            error_counter[error_msg] += 1
-                            is_valid = False
+                            if zip_error:
+                                error_msg = f"{field}: {zip_error}"
+                                row_errors.append(validation_error(code_value, field, error_msg, error_msg, value))
+                                count_error(error_msg)
+                                is_valid = False
                     
-                    elif field_lower == 'signuplanguagecode':
-                        lang_error = validate_language_code(value)
-                        if lang_error:
-                            error_msg = f"signuplanguagecode: {lang_error}"
-                            row_errors.append(f"{code_value} {error_msg}")
-                            error_counter[error_msg] += 1
-                            is_valid = False
+                        elif field_lower == 'signuplanguagecode':
+                            lang_error = validate_language_code(value)
+                            if lang_error:
+                                error_msg = f"signuplanguagecode: {lang_error}"
+                                row_errors.append(validation_error(code_value, field, error_msg, error_msg, value))
+                                count_error(error_msg)
+                                is_valid = False
                     
-                    elif field_lower == 'currencycode':
-                        currency_error = validate_currency_code(value)
-                        if currency_error:
-                            error_msg = f"currencycode: {currency_error}"
-                            row_errors.append(f"{code_value} {error_msg}")
-                            error_counter[error_msg] += 1
-                            is_valid = False
+                        elif field_lower == 'currencycode':
+                            currency_error = validate_currency_code(value)
+                            if currency_error:
+                                error_msg = f"currencycode: {currency_error}"
+                                row_errors.append(validation_error(code_value, field, error_msg, error_msg, value))
+                                count_error(error_msg)
+                                is_valid = False
 
-                address_errors = validate_address_fields(row)
-                if address_errors:
-                    for error in address_errors:
-                        row_errors.append(f"{code_value} {error}")
-                        error_counter[error] += 1
-                        is_valid = False
+                    address_errors = validate_address_fields(row)
+                    if address_errors:
+                        for error in address_errors:
+                            row_errors.append(validation_error(code_value, 'address', error, error))
+                            count_error(error)
+                            is_valid = False
                 
-                language_country_errors = validate_language_country_consistency(row)
-                if language_country_errors:
-                    for error in language_country_errors:
-                        row_errors.append(f"{code_value} {error}")
-                        error_counter[error] += 1
-                        is_valid = False
+                    language_country_errors = validate_language_country_consistency(row)
+                    if language_country_errors:
+                        for error in language_country_errors:
+                            row_errors.append(validation_error(code_value, 'languagecode', error, error))
+                            count_error(error)
+                            is_valid = False
                 
-                regulation_name = selected_regulation.get('name') if selected_regulation else None
-                if regulation_name:
-                    document_validator = validator_registry.get_validator(regulation_name, 'documents')
                     if document_validator:
                         doc_error = document_validator(row)
                         if doc_error:
-                            row_errors.append(f"{code_value} {doc_error}")
-                            error_counter[doc_error] += 1
+                            row_errors.append(validation_error(code_value, 'documents', doc_error, doc_error))
+                            count_error(doc_error)
                             is_valid = False
                 
-                validation_results.append({
-                    'row': current_idx + 1,
-                    'code': code_value,
-                    'valid': is_valid,
-                    'errors': row_errors
-                })
+                    if is_valid:
+                        valid_rows += 1
+                    else:
+                        invalid_rows += 1
+                        for error in row_errors:
+                            errors_jsonl.write(orjson.dumps(detailed_error_record(current_idx + 1, error),
+                                                            option=orjson.OPT_APPEND_NEWLINE))
+                        errors_written += len(row_errors)
+                    
+                    if len(preview_results) < 10:
+                        preview_results.append({
+                            'row': current_idx + 1,
+                            'code': code_value,
+                            'valid': is_valid,
+                            'errors': row_errors
+                        })
             
-            row_idx += len(mapped_chunk)
-        
-        valid_rows = sum(1 for result in validation_results if result['valid'])
-        invalid_rows = len(validation_results) - valid_rows
+                row_idx += len(mapped_chunk)
         
         error_counts_sorted = dict(sorted(error_counter.items(), key=lambda x: x[1], reverse=True))
         
@@ -1218,54 +1369,15 @@ def validate():
         duplicate_personalid_count = len(duplicate_personalids)
         duplicate_idcardno_count = len(duplicate_idcardnos)
         
-        detailed_errors = []
-        for result in validation_results:
-            if not result['valid']:
-                for error in result['errors']:
-                    error_parts = error.split(': ', 2)  
-                    if len(error_parts) >= 2:
-                        code_field = error_parts[0]  
-                        error_message = ': '.join(error_parts[1:])  
-                        
-                        code_field_parts = code_field.rsplit(' ', 1)
-                        if len(code_field_parts) == 2:
-                            field_name = code_field_parts[1]
-                        else:
-                            field_name = "unknown"
-                        
-                        actual_value = ""
-                        if "': '" in error_message and error_message.endswith("'"):
-                            value_start = error_message.rfind(": '") + 3
-                            value_end = error_message.rfind("'")
-                            actual_value = error_message[value_start:value_end]
-                            error_type = error_message[:error_message.rfind(": '")]
-                        else:
-                            error_type = error_message
-                            actual_value = ""
-                        
-                        detailed_errors.append({
-                            'row_number': result['row'],
-                            'code': result['code'],
-                            'field_name': field_name,
-                            'error_type': error_type,
-                            'error_message': error_message,
-                            'invalid_value': actual_value
-                        })
-        
-        if detailed_errors:
-            errors_file_id = str(uuid.uuid4())
-            errors_file_path = os.path.join(TEMP_FOLDER, f"errors_{errors_file_id}.json")
-            
-            with open(errors_file_path, 'w', encoding='utf-8') as f:
-                json.dump(detailed_errors, f, ensure_ascii=False, indent=2)
-            
-            session['errors_file_id'] = errors_file_id
+        if errors_written:
+            state['errors_file_id'] = errors_file_id
         else:
-            session.pop('errors_file_id', None)
+            os.remove(errors_file_path)
+            state.pop('errors_file_id', None)
         
         return jsonify({
             'validation_complete': True,
-            'total_rows': len(validation_results),
+            'total_rows': valid_rows + invalid_rows,
             'valid_rows': valid_rows,
             'invalid_rows': invalid_rows,
             'error_counts': error_counts_sorted,
@@ -1273,11 +1385,12 @@ def validate():
             'duplicate_username_count': duplicate_username_count,
             'duplicate_personalid_count': duplicate_personalid_count,
             'duplicate_idcardno_count': duplicate_idcardno_count,
-            'results': validation_results[:10],
+            'results': preview_results,
             'all_columns': all_columns,
             'required_columns': required_columns,
             'column_mappings': column_mappings,
-            'has_errors_for_download': len(detailed_errors) > 0
+            'has_errors_for_download': errors_written > 0,
+            'validation_token': validation_token
         })
     except Exception as e:
         app.logger.error(f"Validation error: {str(e)}", exc_info=True)
@@ -1,29 +1,155 @@
 import pandas as pd
 import numpy as np
 import multiprocessing as mp
+from multiprocessing import shared_memory
 from functools import partial
 import logging
 import os
+import sys
+import glob
+import shutil
 import mmap
-from typing import List, Dict, Any, Tuple, Optional
+import codecs
+import importlib.util
+from typing import List, Dict, Any, Tuple, Optional, Iterator
 from collections import Counter
 import chardet
+import orjson
 
 logger = logging.getLogger(__name__)
 
+PYARROW_AVAILABLE = importlib.util.find_spec('pyarrow') is not None
+# Fork is only safe on Linux: macOS lists it too, but forking a process that has started
+# threads or initialised system frameworks can crash the child, hence CPython's spawn default there
+FORK_AVAILABLE = sys.platform.startswith('linux') and mp.get_start_method(allow_none=True) in (None, 'fork')
+LINE_COUNT_BLOCK_SIZE = 64 * 1024 * 1024
+ROW_COUNT_CACHE_SIZE = 256
+FILE_INFO_CACHE_SIZE = 256
+ARROW_CSV_BLOCK_SIZE = 8 * 1024 * 1024
+RESULTS_SHARD_BUFFER_SIZE = 1024 * 1024
+DEFAULT_CHUNK_SIZE = 10000
+TARGET_CHUNK_BYTES = 32 * 1024 * 1024
+MIN_CHUNK_ROWS = 1000
+MAX_CHUNK_ROWS = 200000
+ROW_WIDTH_SAMPLE_ROWS = 1000
+DUPLICATE_TRACKED_FIELDS = ('email', 'username', 'personalid', 'idcardno')
+POOLED_CODE_COLUMNS = frozenset({'countrycode', 'currencycode', 'signuplanguagecode',
+                                 'citizenship', 'regioncode', 'provincecode'})
+CHARSET_NORMALIZER_AVAILABLE = importlib.util.find_spec('charset_normalizer') is not None
+
+if PYARROW_AVAILABLE:
+    import pyarrow as pa
+    from pyarrow import csv as pacsv
+
+if CHARSET_NORMALIZER_AVAILABLE:
+    from charset_normalizer import from_bytes
+
+BOM_ENCODINGS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16')
+)
+
+def detect_sample_encoding(sample_bytes: bytes) -> Tuple[Optional[str], float]:
+    """
+    Detect the encoding of a file sample, skipping statistical detection when it is not needed
+    
+    Args:
+        sample_bytes: First bytes of the file
+        
+    Returns:
+        Tuple of (encoding or None, confidence)
+    """
+    for bom, encoding in BOM_ENCODINGS:
+        if sample_bytes.startswith(bom):
+            return encoding, 1.0
+    
+    if sample_bytes.isascii():
+        return 'utf-8', 1.0
+    
+    if CHARSET_NORMALIZER_AVAILABLE:
+        best_match = from_bytes(sample_bytes).best()
+        if best_match is None:
+            return None, 0.0
+        return best_match.encoding, 1.0 - best_match.chaos
+    
+    result = chardet.detect(sample_bytes)
+    return result.get('encoding'), result.get('confidence') or 0.0
+
+_WORKER_DF = None
+_attached_frames = {}
+
+def _init_worker(df: pd.DataFrame):
+    """Pool initializer: keep the forked parent's DataFrame for the worker's lifetime"""
+    global _WORKER_DF
+    _WORKER_DF = df
+
+def _validate_forked_chunk(task: Tuple[int, int], validate_chunk) -> Dict[str, Any]:
+    """Worker side of the fork path: validate rows [start_idx, end_idx) of the inherited DataFrame"""
+    start_idx, end_idx = task
+    return validate_chunk((_WORKER_DF.iloc[start_idx:end_idx], start_idx))
+
+def _validate_shared_chunk(task: Tuple[str, int, int], validate_chunk) -> Dict[str, Any]:
+    """
+    Worker side of the shared-memory path: validate rows [start_idx, end_idx) of the published DataFrame
+    
+    The Arrow stream is mapped once per worker process and sliced without copying.
+    """
+    shm_name, start_idx, end_idx = task
+    
+    attached = _attached_frames.get(shm_name)
+    if attached is None:
+        shm = shared_memory.SharedMemory(name=shm_name)
+        table = pa.ipc.open_stream(pa.py_buffer(shm.buf)).read_all()
+        attached = _attached_frames[shm_name] = (shm, table)
+    
+    chunk_df = attached[1].slice(start_idx, end_idx - start_idx).to_pandas()
+    return validate_chunk((chunk_df, start_idx))
+
+def decode_sample(sample_bytes: bytes, encodings, final: bool = True) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Decode a file sample with the first encoding that accepts it
+    
+    Args:
+        sample_bytes: First bytes of the file
+        encodings: Encodings to try in order
+        final: False when the sample was cut from a longer file, so that a multi-byte
+            character split at the end of the sample does not reject the encoding
+        
+    Returns:
+        Tuple of (decoded text, encoding), or (None, None) if no encoding fits
+    """
+    if sample_bytes.isascii():
+        return sample_bytes.decode('ascii'), next(iter(encodings))
+    
+    for encoding in encodings:
+        decoder = codecs.getincrementaldecoder(encoding)(errors='strict')
+        try:
+            return decoder.decode(sample_bytes, final=final), encoding
+        except UnicodeDecodeError:
+            continue
+    
+    return None, None
+
 class OptimizedDataProcessor:
     """High-performance data processor for large CSV files"""
     
-    def __init__(self, chunk_size: int = 10000, n_workers: Optional[int] = None):
+    def __init__(self, chunk_size: Optional[int] = None, n_workers: Optional[int] = None):
         """
         Initialize the data processor
         
         Args:
-            chunk_size: Number of rows to process in each chunk
+            chunk_size: Number of rows to process in each chunk (defaults to sizing
+                validation chunks from the row width of each DataFrame)
             n_workers: Number of worker processes (defaults to CPU count)
         """
-        self.chunk_size = chunk_size
+        self.adaptive_chunk_size = chunk_size is None
+        self.chunk_size = chunk_size or DEFAULT_CHUNK_SIZE
         self.n_workers = n_workers or min(mp.cpu_count(), 4)  
+        self._row_counts = {}
+        self._file_infos = {}
         
     def detect_file_info(self, file_path: str) -> Dict[str, Any]:
         """
@@ -36,30 +162,26 @@ class OptimizedDataProcessor:
             Dictionary with file information
         """
         try:
+            cache_key = self._file_version_key(file_path)
+            file_info = self._file_infos.get(cache_key)
+            if file_info is not None:
+                return dict(file_info)
+            
             with open(file_path, 'rb') as f:
                 with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mmapped_file:
                     sample_size = min(10240, len(mmapped_file)) 
                     sample_bytes = mmapped_file[:sample_size]
                     
-                    encoding_result = chardet.detect(sample_bytes)
-                    detected_encoding = encoding_result.get('encoding', 'utf-8')
-                    confidence = encoding_result.get('confidence', 0.0)
+                    detected_encoding, confidence = detect_sample_encoding(sample_bytes)
                     
                     if confidence < 0.7 or detected_encoding is None:
                         encoding = 'utf-8'
                     else:
                         encoding = detected_encoding
                     
-                    sample_text = None
-                    encoding_attempts = [encoding, 'utf-8', 'latin1', 'cp1252']
-                    
-                    for attempt_encoding in encoding_attempts:
-                        try:
-                            sample_text = sample_bytes.decode(attempt_encoding)
-                            encoding = attempt_encoding  
-                            break
-                        except UnicodeDecodeError:
-                            continue
+                    encoding_attempts = dict.fromkeys([encoding, 'utf-8', 'latin1', 'cp1252'])
+                    sample_text, encoding = decode_sample(sample_bytes, encoding_attempts,
+                                                          final=sample_size == len(mmapped_file))
                     
                     if sample_text is None:
                         sample_text = sample_bytes.decode('utf-8', errors='replace')
@@ -68,14 +190,19 @@ class OptimizedDataProcessor:
                     delimiter = self._detect_delimiter(sample_text)
                     
                     file_size = len(mmapped_file)
-                    
-            return {
+            
+            file_info = {
                 'encoding': encoding,
                 'delimiter': delimiter,
                 'file_size': file_size,
-                'confidence': encoding_result.get('confidence', 0.8)
+                'confidence': confidence
             }
             
+            if len(self._file_infos) >= FILE_INFO_CACHE_SIZE:
+                self._file_infos.pop(next(iter(self._file_infos)))
+            self._file_infos[cache_key] = file_info
+            return dict(file_info)
+            
         except Exception as e:
             logger.error(f"Error detecting file info: {str(e)}")
             return {
@@ -86,17 +213,17 @@ class OptimizedDataProcessor:
             }
     
     def _detect_delimiter(self, sample_text: str) -> str:
-        """Detect CSV delimiter from sample text"""
+        """Detect CSV delimiter from the first 5 lines of sample text"""
         delimiters = [',', ';', '\t', '|']
-        delimiter_counts = {}
         
-        lines = sample_text.split('\n')[:5] 
+        head_end = -1
+        for _ in range(5):
+            head_end = sample_text.find('\n', head_end + 1)
+            if head_end == -1:
+                break
+        head = sample_text if head_end == -1 else sample_text[:head_end]
         
-        for delimiter in delimiters:
-            count = sum(line.count(delimiter) for line in lines)
-            delimiter_counts[delimiter] = count
-            
-        return max(delimiter_counts.items(), key=lambda x: x[1])[0]
+        return max(delimiters, key=head.count)
     
     def read_csv_optimized(self, file_path: str, **kwargs) -> pd.DataFrame:
         """
@@ -123,11 +250,19 @@ class OptimizedDataProcessor:
         default_params.update(kwargs)
         
         try:
-            if file_info['file_size'] > 100 * 1024 * 1024:  
-                logger.info(f"Large file detected ({file_info['file_size'] / 1024 / 1024:.1f}MB), using chunked reading")
-                return self._read_large_file_chunked(file_path, default_params)
-            else:
-                return pd.read_csv(file_path, **default_params)
+            df = None
+            if PYARROW_AVAILABLE and not kwargs:
+                df = self._read_csv_arrow(file_path, file_info)
+            
+            if df is None:
+                if file_info['file_size'] > 100 * 1024 * 1024:  
+                    logger.info(f"Large file detected ({file_info['file_size'] / 1024 / 1024:.1f}MB), using chunked reading")
+                    df = self._read_large_file_chunked(file_path, default_params)
+                else:
+                    df = pd.read_csv(file_path, **default_params)
+            
+            self._remember_row_count(file_path, len(df))
+            return df
                 
         except (UnicodeDecodeError, Exception) as e:
             logger.error(f"Error reading CSV with pandas: {str(e)}")
@@ -156,6 +291,45 @@ class OptimizedDataProcessor:
             }
             return pd.read_csv(file_path, **fallback_params)
     
+    def _read_csv_arrow(self, file_path: str, file_info: Dict) -> Optional[pd.DataFrame]:
+        """
+        Read the whole file with pyarrow's multi-threaded block parser
+        
+        Every column is typed as a string up front, so values such as '007' keep their
+        leading zeros, and the result uses Arrow-backed string columns. Low-cardinality code
+        columns become object columns instead, where each distinct value is a single shared
+        str object.
+        
+        Args:
+            file_path: Path to CSV file
+            file_info: Result of detect_file_info
+            
+        Returns:
+            DataFrame with the CSV data, or None if the header has repeated column names
+        """
+        read_options = pacsv.ReadOptions(encoding=file_info['encoding'], block_size=ARROW_CSV_BLOCK_SIZE)
+        parse_options = pacsv.ParseOptions(delimiter=file_info['delimiter'])
+        
+        header_reader = pacsv.open_csv(file_path, read_options=read_options, parse_options=parse_options)
+        column_names = header_reader.schema.names
+        header_reader.close()
+        
+        if len(set(column_names)) != len(column_names):
+            return None
+        
+        convert_options = pacsv.ConvertOptions(
+            column_types={name: pa.large_string() if name.lower() in POOLED_CODE_COLUMNS else pa.string()
+                          for name in column_names},
+            strings_can_be_null=False
+        )
+        table = pacsv.read_csv(file_path, read_options=read_options,
+                               parse_options=parse_options, convert_options=convert_options)
+        
+        # Only pa.string() is mapped; large_string code columns take the default object
+        # conversion, which deduplicates repeated values
+        return table.to_pandas(types_mapper={pa.string(): pd.StringDtype('pyarrow')}.get,
+                               deduplicate_objects=True)
+    
     def _read_large_file_chunked(self, file_path: str, params: Dict) -> pd.DataFrame:
         """Read large files in chunks and concatenate"""
         chunks = []
@@ -227,64 +401,71 @@ class OptimizedDataProcessor:
                 'file_info': file_info
             }
     
+    def _file_version_key(self, file_path: str) -> Tuple[str, float, int]:
+        """Identify a file version by path, modification time and size"""
+        stat = os.stat(file_path)
+        return (file_path, stat.st_mtime, stat.st_size)
+    
+    def _remember_row_count(self, file_path: str, row_count: int):
+        """Record the row count of a fully parsed file"""
+        if len(self._row_counts) >= ROW_COUNT_CACHE_SIZE:
+            self._row_counts.pop(next(iter(self._row_counts)))
+        self._row_counts[self._file_version_key(file_path)] = row_count
+    
     def _count_file_rows(self, file_path: str, file_info: Dict) -> int:
         """Efficiently count rows in CSV file"""
         try:
-            if file_info['file_size'] < 50 * 1024 * 1024: 
-                encoding_attempts = [file_info['encoding'], 'utf-8', 'latin1', 'cp1252']
-                
-                for encoding in encoding_attempts:
-                    try:
-                        df = pd.read_csv(
-                            file_path,
-                            encoding=encoding,
-                            sep=file_info['delimiter'],
-                            usecols=[0],  
-                            dtype=str
-                        )
-                        return len(df)
-                    except UnicodeDecodeError:
-                        continue
-                
-                df = pd.read_csv(
-                    file_path,
-                    encoding='utf-8',
-                    encoding_errors='replace',
-                    sep=file_info['delimiter'],
-                    usecols=[0],
-                    dtype=str
-                )
-                return len(df)
-            else:
-                encoding_attempts = [file_info['encoding'], 'utf-8', 'latin1', 'cp1252']
-                
-                for encoding in encoding_attempts:
-                    try:
-                        with open(file_path, 'r', encoding=encoding) as f:
-                            return sum(1 for _ in f) - 1  
-                    except UnicodeDecodeError:
-                        continue
-                
-                with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-                    return sum(1 for _ in f) - 1
+            row_count = self._row_counts.get(self._file_version_key(file_path))
+            if row_count is not None:
+                return row_count
+            
+            return max(self._count_lines(file_path) - 1, 0)
                     
         except Exception as e:
             logger.warning(f"Error counting rows: {str(e)}")
             return 0
     
+    def _count_lines(self, file_path: str) -> int:
+        """Count lines by scanning the raw bytes for newlines, without decoding the file"""
+        line_count = 0
+        
+        with open(file_path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mmapped_file:
+                if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                    mmapped_file.madvise(mmap.MADV_SEQUENTIAL)
+                
+                file_size = len(mmapped_file)
+                for offset in range(0, file_size, LINE_COUNT_BLOCK_SIZE):
+                    line_count += mmapped_file[offset:offset + LINE_COUNT_BLOCK_SIZE].count(b'\n')
+                
+                if file_size and mmapped_file[file_size - 1:] != b'\n':
+                    line_count += 1
+        
+        return line_count
+    
     def validate_dataframe_parallel(self, df: pd.DataFrame, validation_func, 
                                   required_columns: List[str], 
                                   column_mappings: Dict[str, str] = None,
-                                  regulation_info: Dict = None) -> Dict[str, Any]:
+                                  regulation_info: Dict = None,
+                                  results_path: Optional[str] = None,
+                                  sample_size: int = 100) -> Dict[str, Any]:
         """
         Validate DataFrame using parallel processing
         
+        With results_path, each chunk writes its invalid rows to a JSON lines shard on disk and
+        only keeps its counters and first rows in memory. The shards are concatenated in row
+        order into results_path, and 'results' holds the first sample_size rows.
+        
         Args:
             df: DataFrame to validate
-            validation_func: Validation function to apply
+            validation_func: Column-wise validation function, called as
+                validation_func(chunk_df, required_columns=..., regulation_info=...) and
+                returning (valid flag per row, validation_error records per row)
             required_columns: List of required columns to validate
             column_mappings: Column name mappings
             regulation_info: Regulation-specific information
+            results_path: Optional JSON lines file receiving the invalid row results
+            sample_size: Number of row results returned when streaming to results_path
             
         Returns:
             Dictionary with validation results
@@ -292,125 +473,254 @@ class OptimizedDataProcessor:
         if column_mappings:
             df = df.rename(columns=column_mappings)
         
-        chunks = self._split_dataframe(df, self.chunk_size)
-        
         validate_chunk = partial(
             self._validate_chunk,
             validation_func=validation_func,
             required_columns=required_columns,
-            regulation_info=regulation_info
+            regulation_info=regulation_info,
+            results_path=results_path,
+            sample_size=sample_size
         )
         
-        with mp.Pool(processes=self.n_workers) as pool:
-            chunk_results = pool.map(validate_chunk, chunks)
+        chunk_size = self._validation_chunk_size(df)
+        
+        try:
+            if len(df) <= chunk_size * 2:
+                # Pool startup and pickling cost more than they save for a couple of chunks
+                chunk_results = [validate_chunk((df, 0))]
+            else:
+                chunk_results = self._validate_chunks_in_pool(df, validate_chunk, chunk_size)
+            
+            chunk_results.sort(key=lambda chunk_result: chunk_result['start_idx'])
+            if results_path:
+                self._merge_results_shards(chunk_results, results_path)
+        except Exception:
+            if results_path:
+                for shard_path in glob.glob(glob.escape(results_path) + '.*'):
+                    os.remove(shard_path)
+            raise
+        
+        duplicates = self._find_duplicates_vectorized(df, DUPLICATE_TRACKED_FIELDS)
+        return self._combine_validation_results(chunk_results, duplicates,
+                                                sample_size if results_path else None)
+    
+    def _validation_chunk_size(self, df: pd.DataFrame) -> int:
+        """
+        Rows per validation chunk, aiming at TARGET_CHUNK_BYTES of data per chunk
+        
+        The row width is estimated from the first ROW_WIDTH_SAMPLE_ROWS rows. A chunk_size
+        given to the constructor is used as is.
+        """
+        if not self.adaptive_chunk_size or df.empty:
+            return self.chunk_size
         
-        return self._combine_validation_results(chunk_results)
+        sample = df.iloc[:ROW_WIDTH_SAMPLE_ROWS]
+        row_bytes = sample.memory_usage(deep=True, index=False).sum() / len(sample)
+        return max(MIN_CHUNK_ROWS, min(MAX_CHUNK_ROWS, int(TARGET_CHUNK_BYTES / max(row_bytes, 1))))
     
-    def _split_dataframe(self, df: pd.DataFrame, chunk_size: int) -> List[Tuple[pd.DataFrame, int]]:
-        """Split DataFrame into chunks with starting indices"""
-        chunks = []
-        for start_idx in range(0, len(df), chunk_size):
-            end_idx = min(start_idx + chunk_size, len(df))
-            chunk_df = df.iloc[start_idx:end_idx].copy()
-            chunks.append((chunk_df, start_idx))
-        return chunks
+    def _validate_chunks_in_pool(self, df: pd.DataFrame, validate_chunk, chunk_size: int) -> List[Dict]:
+        """
+        Validate the DataFrame chunk by chunk in a worker pool sized to the number of chunks
+        
+        Workers are forked on Linux. Elsewhere they read the frame from shared memory
+        when pyarrow is available, and receive pickled chunks otherwise.
+        """
+        n_workers = min(self.n_workers, max(1, len(df) // chunk_size))
+        row_ranges = self._split_dataframe(len(df), chunk_size)
+        
+        if FORK_AVAILABLE:
+            # Forked workers share the parent's pages copy-on-write, so only row offsets are sent
+            fork_context = mp.get_context('fork')
+            with fork_context.Pool(processes=n_workers, initializer=_init_worker, initargs=(df,)) as pool:
+                return list(pool.imap_unordered(
+                    partial(_validate_forked_chunk, validate_chunk=validate_chunk), row_ranges))
+        
+        shm = self._share_dataframe(df) if PYARROW_AVAILABLE else None
+        try:
+            with mp.Pool(processes=n_workers) as pool:
+                if shm is not None:
+                    tasks = ((shm.name, start_idx, end_idx) for start_idx, end_idx in row_ranges)
+                    return list(pool.imap_unordered(
+                        partial(_validate_shared_chunk, validate_chunk=validate_chunk), tasks))
+                
+                chunks = ((df.iloc[start_idx:end_idx], start_idx) for start_idx, end_idx in row_ranges)
+                return list(pool.imap_unordered(validate_chunk, chunks))
+        finally:
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+    
+    def _share_dataframe(self, df: pd.DataFrame) -> Optional[shared_memory.SharedMemory]:
+        """
+        Write the DataFrame once as an Arrow IPC stream into shared memory
+        
+        Workers then receive only row offsets instead of pickled chunks.
+        
+        Args:
+            df: DataFrame to publish
+            
+        Returns:
+            SharedMemory block holding the stream, or None if the frame cannot be converted
+        """
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+        except (pa.ArrowException, ValueError) as e:
+            logger.warning(f"Falling back to pickled chunks: {str(e)}")
+            return None
+        
+        size_counter = pa.MockOutputStream()
+        with pa.ipc.new_stream(size_counter, table.schema) as writer:
+            writer.write_table(table)
+        
+        shm = shared_memory.SharedMemory(create=True, size=max(size_counter.size(), 1))
+        shm_buffer = pa.py_buffer(shm.buf)
+        sink = pa.FixedSizeBufferWriter(shm_buffer)
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        sink.close()
+        del sink, shm_buffer
+        
+        return shm
+    
+    def _split_dataframe(self, n_rows: int, chunk_size: int) -> Iterator[Tuple[int, int]]:
+        """Yield the (start, end) row range of each chunk; workers slice the frame themselves"""
+        for start_idx in range(0, n_rows, chunk_size):
+            yield start_idx, min(start_idx + chunk_size, n_rows)
     
     def _validate_chunk(self, chunk_data: Tuple[pd.DataFrame, int], 
                        validation_func, required_columns: List[str],
-                       regulation_info: Dict = None) -> Dict[str, Any]:
-        """Validate a single chunk of data"""
+                       regulation_info: Dict = None, results_path: Optional[str] = None,
+                       sample_size: int = 100) -> Dict[str, Any]:
+        """Validate a single chunk of data, optionally writing its invalid rows to a shard file"""
         chunk_df, start_idx = chunk_data
         
         validation_results = []
-        error_counter = Counter()
-        duplicate_tracking = {
-            'emails': {},
-            'usernames': {},
-            'personalids': {},
-            'idcardnos': {}
-        }
+        error_counter = {}
+        valid_count = 0
+        shard_path = f"{results_path}.{start_idx}" if results_path else None
+        shard = open(shard_path, 'wb', buffering=RESULTS_SHARD_BUFFER_SIZE) if shard_path else None
         
-        for idx, row in chunk_df.iterrows():
-            row_dict = row.to_dict()
-            global_idx = start_idx + (idx - chunk_df.index[0])
-            
-            result = validation_func(
-                row_data=row_dict, 
-                row_index=global_idx, 
-                required_columns=required_columns, 
+        try:
+            valid_mask, errors_per_row = validation_func(
+                chunk_df,
+                required_columns=required_columns,
                 regulation_info=regulation_info
             )
             
-            validation_results.append(result)
-            
-            if not result['valid']:
-                for error in result['errors']:
-                    error_counter[error] += 1
+            codes = chunk_df['code'].tolist() if 'code' in chunk_df.columns else ['N/A'] * len(chunk_df)
             
-            self._track_duplicates_in_chunk(row_dict, global_idx, duplicate_tracking)
+            for position, (is_valid, row_errors) in enumerate(zip(valid_mask, errors_per_row)):
+                if is_valid:
+                    valid_count += 1
+                if shard is not None and is_valid and position >= sample_size:
+                    continue
+                
+                result = {
+                    'row': start_idx + position + 1,
+                    'code': codes[position],
+                    'valid': is_valid,
+                    'errors': row_errors
+                }
+                
+                if shard is None or position < sample_size:
+                    validation_results.append(result)
+                if shard is not None and not is_valid:
+                    shard.write(orjson.dumps(result, option=orjson.OPT_APPEND_NEWLINE))
+                
+                for error in row_errors:
+                    error_type = error['error_type']
+                    error_counter[error_type] = error_counter.get(error_type, 0) + 1
+        finally:
+            if shard is not None:
+                shard.close()
         
         return {
             'results': validation_results,
             'error_counter': error_counter,
-            'duplicate_tracking': duplicate_tracking,
+            'valid_count': valid_count,
+            'results_shard': shard_path,
             'start_idx': start_idx,
             'chunk_size': len(chunk_df)
         }
     
-    def _track_duplicates_in_chunk(self, row: Dict, idx: int, tracking: Dict):
-        """Track duplicate values within a chunk"""
-        fields_to_track = ['email', 'username', 'personalid', 'idcardno']
-        
-        for field in fields_to_track:
-            if field in row and row[field]:
-                value = str(row[field]).strip().lower()
-                if value:
-                    field_key = f"{field}s"
-                    if value in tracking[field_key]:
-                        tracking[field_key][value].append(idx)
-                    else:
-                        tracking[field_key][value] = [idx]
+    def _merge_results_shards(self, chunk_results: List[Dict], results_path: str):
+        """Concatenate the chunks' result shards, in row order, into one file"""
+        with open(results_path, 'wb') as results_file:
+            for chunk_result in chunk_results:
+                shard_path = chunk_result['results_shard']
+                with open(shard_path, 'rb') as shard:
+                    shutil.copyfileobj(shard, results_file, RESULTS_SHARD_BUFFER_SIZE)
+                os.remove(shard_path)
     
-    def _combine_validation_results(self, chunk_results: List[Dict]) -> Dict[str, Any]:
-        """Combine results from parallel validation"""
+    def _find_duplicates_vectorized(self, df: pd.DataFrame, fields) -> Dict[str, Dict[str, List[int]]]:
+        """
+        Find repeated values of the tracked fields over the whole DataFrame
+        
+        Values are compared stripped and lowercased. Each column is factorized in one
+        hash pass and the codes are sorted so that equal values form adjacent runs.
+        
+        Args:
+            df: DataFrame that was validated
+            fields: Column names to check
+            
+        Returns:
+            Per field (pluralized key), each duplicated value mapped to its 0-based row indices;
+            values that occur only once are left out
+        """
+        duplicates = {}
+        
+        for field in fields:
+            field_duplicates = duplicates[f"{field}s"] = {}
+            if field not in df.columns:
+                continue
+            
+            values = df[field].astype('string').str.strip().str.lower()
+            positions = np.flatnonzero((values.notna() & (values != '')).to_numpy(dtype=bool))
+            codes, uniques = pd.factorize(values.to_numpy(dtype=object)[positions])
+            
+            order = np.argsort(codes, kind='stable')
+            sorted_codes = codes[order]
+            run_starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+            run_lengths = np.diff(np.r_[run_starts, len(sorted_codes)])
+            
+            repeated = run_lengths > 1
+            for run_start, run_length in zip(run_starts[repeated], run_lengths[repeated]):
+                value = uniques[sorted_codes[run_start]]
+                field_duplicates[value] = positions[order[run_start:run_start + run_length]].tolist()
+        
+        return duplicates
+    
+    def _combine_validation_results(self, chunk_results: List[Dict],
+                                    duplicates: Dict[str, Dict[str, List[int]]],
+                                    sample_size: Optional[int] = None) -> Dict[str, Any]:
+        """Combine results from parallel validation, keeping only sample_size row results if given"""
         all_results = []
-        combined_error_counter = Counter()
-        global_duplicate_tracking = {
-            'emails': {},
-            'usernames': {},
-            'personalids': {},
-            'idcardnos': {}
-        }
+        combined_error_counter = {}
         
         for chunk_result in chunk_results:
-            all_results.extend(chunk_result['results'])
-            combined_error_counter.update(chunk_result['error_counter'])
-            
-            for field_key, field_tracking in chunk_result['duplicate_tracking'].items():
-                for value, indices in field_tracking.items():
-                    if value in global_duplicate_tracking[field_key]:
-                        global_duplicate_tracking[field_key][value].extend(indices)
-                    else:
-                        global_duplicate_tracking[field_key][value] = indices
+            if sample_size is None or len(all_results) < sample_size:
+                all_results.extend(chunk_result['results'])
+            for error, count in chunk_result['error_counter'].items():
+                combined_error_counter[error] = combined_error_counter.get(error, 0) + count
         
-        duplicate_counts = {}
-        for field_key, field_tracking in global_duplicate_tracking.items():
-            duplicate_counts[field_key] = sum(
-                1 for indices in field_tracking.values() if len(indices) > 1
-            )
+        if sample_size is not None:
+            del all_results[sample_size:]
+        
+        duplicate_counts = {field_key: len(field_duplicates) for field_key, field_duplicates in duplicates.items()}
         
-        valid_rows = sum(1 for result in all_results if result['valid'])
-        invalid_rows = len(all_results) - valid_rows
+        total_rows = sum(chunk_result['chunk_size'] for chunk_result in chunk_results)
+        valid_rows = sum(chunk_result['valid_count'] for chunk_result in chunk_results)
+        invalid_rows = total_rows - valid_rows
         
         return {
             'validation_complete': True,
-            'total_rows': len(all_results),
+            'total_rows': total_rows,
             'valid_rows': valid_rows,
             'invalid_rows': invalid_rows,
-            'error_counts': dict(combined_error_counter.most_common()),
+            'error_counts': dict(Counter(combined_error_counter).most_common()),
             'duplicate_counts': duplicate_counts,
             'results': all_results,
-            'global_duplicates': global_duplicate_tracking
+            'duplicated_values': duplicates
         }
     
     def get_memory_usage_estimate(self, file_path: str) -> Dict[str, Any]:
@@ -1,12 +1,57 @@
 
+import importlib.util
+import re
 import logging
-from typing import Dict, List, Any
+import sys
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List, Any, Tuple
 from collections import Counter
+from collections.abc import Mapping
+import numpy as np
+import pandas as pd
 from validators_common import *
 from validator_registry import validator_registry
 
+PYARROW_AVAILABLE = importlib.util.find_spec('pyarrow') is not None
+
+if PYARROW_AVAILABLE:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
 logger = logging.getLogger(__name__)
 
+PHONE_FIELDS = frozenset({'phone', 'cellphone'})
+ZIP_FIELDS = frozenset({'zipcode', 'postalcode', 'zip', 'postcode'})
+
+# Field -> (pattern, case applied before matching, min length, max length) such that a stripped
+# value satisfying all four certainly passes the field's scalar validator
+PASSING_VALUE_RULES = {
+    'phone': (PHONE_PATTERN, None, 1, None),
+    'cellphone': (PHONE_PATTERN, None, 1, None),
+    'firstname': (NAME_PATTERN, None, 1, 50),
+    'lastname': (NAME_PATTERN, None, 1, 50),
+    'province': (NAME_PATTERN, None, 2, 50),
+    'idcardno': (PERSONAL_ID_PATTERN, None, 5, 20)
+}
+
+# Characters str.strip() removes, so Arrow-side trimming gives the same stripped values
+PYTHON_WHITESPACE = ('\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680\u2000\u2001\u2002\u2003\u2004'
+                     '\u2005\u2006\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000')
+
+ASCII_LETTERS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'
+
+# Short ASCII code fields: field -> (allowed characters, min length, max length) such that a
+# stripped value of allowed characters only certainly passes the field's scalar validator
+ASCII_CODE_RULES = {
+    'countrycode': (ASCII_LETTERS, 2, 2),
+    'citizenship': (ASCII_LETTERS, 2, 2),
+    'currencycode': (ASCII_LETTERS, 3, 3),
+    'signuplanguagecode': (ASCII_LETTERS, 2, 2),
+    'regioncode': (ASCII_LETTERS + '0123456789-_', 1, 10),
+    'provincecode': (ASCII_LETTERS + '0123456789-_', 1, 10)
+}
+
 def enhance_error_with_value(error_message: str, field_name: str, field_value: Any) -> str:
     """
     Enhance generic error message with actual invalid value
@@ -26,6 +71,46 @@ def enhance_error_with_value(error_message: str, field_name: str, field_value: A
     
     return f"{error_message}: '{field_value_str}'"
 
+def validation_error(code, field, error_type, message, value=''):
+    """
+    Build a structured validation error
+    
+    Args:
+        code: Value of the row's code column
+        field: Field the error refers to
+        error_type: Generic error, as counted in the error summary
+        message: Human-readable message (shown as "{code} {message}")
+        value: The invalid value, if any
+        
+    Returns:
+        Dictionary describing the error
+    """
+    return {'code': code, 'field': field, 'error_type': error_type, 'value': value, 'message': message}
+
+@lru_cache(maxsize=64)
+def _row_validation_plan(fields: Tuple, required_columns: Tuple) -> Tuple:
+    """
+    Select the fields of a row layout that need validation, lowercased once per layout
+    
+    Args:
+        fields: Column names of the row, in order
+        required_columns: Columns to validate
+        
+    Returns:
+        Tuple of (field, interned lowercase field) pairs
+    """
+    required_columns_lower = frozenset(sys.intern(col.lower()) for col in required_columns)
+    
+    plan = []
+    for field in fields:
+        if field is None:
+            continue
+        field_lower = sys.intern(field.lower())
+        if field_lower in required_columns_lower:
+            plan.append((field, field_lower))
+    
+    return tuple(plan)
+
 def validate_single_row(row_data: Dict[str, Any], row_index: int, 
                        required_columns: List[str], 
                        regulation_info: Dict = None) -> Dict[str, Any]:
@@ -46,46 +131,17 @@ def validate_single_row(row_data: Dict[str, Any], row_index: int,
     code_value = row_data.get('code', 'N/A')
     
     selected_regulation = regulation_info.get('regulation') if regulation_info else None
-    required_columns_lower = [col.lower() for col in required_columns]
-    
-    def should_validate(column_name):
-        if column_name is None:
-            return False
-        return column_name.lower() in required_columns_lower
     
-    for field in row_data.keys():
-        if field is None or not should_validate(field):
-            continue
-        
-        value = row_data[field]
-        field_lower = field.lower() if field is not None else ""
-        
-        if (field_lower == 'personalid' and 
-            selected_regulation and selected_regulation.get('name') == 'Peru'):
-            citizenship = row_data.get('citizenship', '')
-            if str(citizenship).strip().upper() == 'ES' and not str(value).strip():
-                error_msg = f"{field} is required for Spanish residents"
-                row_errors.append(f"{code_value} {error_msg}")
-                is_valid = False
-                continue
-            elif not str(value).strip():
-                continue
-        elif not str(value).strip():
-            error_msg = f"{field} is required but missing"
-            row_errors.append(f"{code_value} {error_msg}")
-            is_valid = False
-            continue
-        
-        error = _validate_field(field_lower, value, row_data, selected_regulation)
+    for field, field_lower in _row_validation_plan(tuple(row_data), tuple(required_columns)):
+        error = _field_error(field, field_lower, row_data[field], row_data, selected_regulation)
         if error:
-            enhanced_error = enhance_error_with_value(error, field, value)
-            row_errors.append(f"{code_value} {field}: {enhanced_error}")
+            row_errors.append(dict(error, code=code_value))
             is_valid = False
     
     cross_field_errors = _validate_cross_fields(row_data, selected_regulation)
     if cross_field_errors:
         for error in cross_field_errors:
-            row_errors.append(f"{code_value} {error}")
+            row_errors.append(dict(error, code=code_value))
             is_valid = False
     
     return {
@@ -95,6 +151,516 @@ def validate_single_row(row_data: Dict[str, Any], row_index: int,
         'errors': row_errors
     }
 
+def validate_columns(df, required_columns: List[str], 
+                     regulation_info: Dict = None) -> Tuple[List[bool], List[List[Dict]]]:
+    """
+    Validate a DataFrame column by column, with the same rules and messages as validate_single_row
+    
+    Each field validator runs once per distinct value (or distinct combination of the values
+    it depends on) instead of once per row, and rows are never materialized as Series.
+    
+    Args:
+        df: DataFrame to validate
+        required_columns: List of required columns to validate
+        regulation_info: Regulation-specific information
+        
+    Returns:
+        Tuple of (valid flag per row, list of validation_error records per row)
+    """
+    if PYARROW_AVAILABLE and any(dtype == 'string[pyarrow]' for dtype in df.dtypes):
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+        except (pa.ArrowException, ValueError) as e:
+            logger.warning(f"Validating Arrow-backed columns as Python objects: {str(e)}")
+        else:
+            return validate_arrow(table, required_columns, regulation_info)
+    
+    columns = df.to_dict('list')
+    n_rows = len(df)
+    codes = columns.get('code', ['N/A'] * n_rows)
+    
+    selected_regulation = regulation_info.get('regulation') if regulation_info else None
+    
+    # Errors are collected as (positions, records) arrays and only assigned to rows once all checks ran
+    error_positions = []
+    error_records = []
+    
+    def add_errors(records, positions=None):
+        records = np.array(list(records), dtype=object)
+        failing = records.astype(bool)
+        positions = np.arange(n_rows) if positions is None else np.asarray(positions, dtype=np.int64)
+        error_positions.append(positions[failing])
+        error_records.append(records[failing])
+    
+    for field, field_lower in _row_validation_plan(tuple(columns), tuple(required_columns)):
+        context_fields = _field_context(field_lower, selected_regulation)
+        
+        def field_error(value, *context_values):
+            row_data = dict(zip(context_fields, context_values))
+            return _field_error(field, field_lower, value, row_data, selected_regulation)
+        
+        field_columns = [columns[field]] + [columns.get(name, [''] * n_rows) for name in context_fields]
+        
+        passing = _passing_rows(field_lower, columns[field], selected_regulation)
+        if passing is None:
+            add_errors(_map_unique(field_error, *field_columns))
+            continue
+        
+        # Only values the vectorized check could not clear go through the scalar validators
+        positions = np.flatnonzero(~passing).tolist()
+        if positions:
+            subsets = [[column[position] for position in positions] for column in field_columns]
+            add_errors(_map_unique(field_error, *subsets), positions)
+    
+    empty_column = [''] * n_rows
+    
+    for cross_field, cross_field_errors in (
+        ('address', _address_errors(columns.get('address', empty_column), columns.get('city', empty_column))),
+        ('languagecode', _language_country_errors(columns.get('languagecode', empty_column),
+                                                  columns.get('countrycode', empty_column)))
+    ):
+        if cross_field_errors:
+            positions, messages = zip(*cross_field_errors)
+            add_errors((_cross_field_error(cross_field, message) for message in messages), positions)
+    
+    if selected_regulation:
+        regulation = validator_registry.resolve_regulation(selected_regulation.get('name'))
+        if regulation['document_columns']:
+            document_errors = regulation['document_columns'](columns, n_rows)
+            if document_errors:
+                positions, messages = zip(*document_errors)
+                add_errors((_cross_field_error('documents', message) for message in messages), positions)
+        elif regulation['documents']:
+            add_errors(_cross_field_error('documents', regulation['documents'](row_data))
+                       for row_data in df.to_dict('records'))
+    
+    return _assemble_errors(codes, error_positions, error_records, n_rows)
+
+def validate_arrow(table, required_columns: List[str],
+                   regulation_info: Dict = None) -> Tuple[List[bool], List[List[Dict]]]:
+    """
+    Validate an Arrow table column by column, with the same rules and messages as validate_columns
+    
+    The vectorized passing checks run as Arrow compute kernels on the string buffers, and only
+    the values of rows they cannot clear are converted to Python objects for the scalar validators.
+    
+    Args:
+        table: pyarrow Table with string columns
+        required_columns: List of required columns to validate
+        regulation_info: Regulation-specific information
+        
+    Returns:
+        Tuple of (valid flag per row, list of validation_error records per row)
+    """
+    n_rows = table.num_rows
+    names = frozenset(table.column_names)
+    
+    selected_regulation = regulation_info.get('regulation') if regulation_info else None
+    
+    error_positions = []
+    error_records = []
+    
+    def add_errors(records, positions):
+        records = np.array(list(records), dtype=object)
+        failing = records.astype(bool)
+        error_positions.append(np.asarray(positions, dtype=np.int64)[failing])
+        error_records.append(records[failing])
+    
+    def take(name, positions):
+        if name not in names:
+            return [''] * len(positions)
+        return table.column(name).take(pa.array(positions, type=pa.int64())).to_pylist()
+    
+    def column_values(name):
+        return table.column(name).to_pylist() if name in names else [''] * n_rows
+    
+    for field, field_lower in _row_validation_plan(tuple(table.column_names), tuple(required_columns)):
+        context_fields = _field_context(field_lower, selected_regulation)
+        
+        def field_error(value, *context_values):
+            row_data = dict(zip(context_fields, context_values))
+            return _field_error(field, field_lower, value, row_data, selected_regulation)
+        
+        passing = _arrow_passing_rows(field_lower, table.column(field), selected_regulation)
+        if passing is None:
+            passing = _passing_rows(field_lower, table.column(field).to_pylist(), selected_regulation)
+        
+        positions = np.arange(n_rows) if passing is None else np.flatnonzero(~passing)
+        if len(positions):
+            subsets = [take(name, positions) for name in (field,) + tuple(context_fields)]
+            add_errors(_map_unique(field_error, *subsets), positions)
+    
+    for cross_field, cross_field_errors in (
+        ('address', _address_errors(column_values('address'), column_values('city'))),
+        ('languagecode', _language_country_errors(column_values('languagecode'), column_values('countrycode')))
+    ):
+        if cross_field_errors:
+            positions, messages = zip(*cross_field_errors)
+            add_errors((_cross_field_error(cross_field, message) for message in messages), positions)
+    
+    if selected_regulation:
+        regulation = validator_registry.resolve_regulation(selected_regulation.get('name'))
+        if regulation['document_columns']:
+            document_errors = regulation['document_columns'](_ArrowColumns(table), n_rows)
+            if document_errors:
+                positions, messages = zip(*document_errors)
+                add_errors((_cross_field_error('documents', message) for message in messages), positions)
+        elif regulation['documents']:
+            add_errors((_cross_field_error('documents', regulation['documents'](row_data))
+                        for row_data in table.to_pylist()), np.arange(n_rows))
+    
+    # Codes are only needed for the rows that have errors
+    failing_positions = np.unique(np.concatenate(error_positions)) if error_positions else np.zeros(0, dtype=np.int64)
+    failing_codes = take('code', failing_positions) if 'code' in names else ['N/A'] * len(failing_positions)
+    codes = dict(zip(failing_positions.tolist(), failing_codes))
+    
+    return _assemble_errors(codes, error_positions, error_records, n_rows)
+
+class _ArrowColumns(Mapping):
+    """Read-only column name -> list of values view of an Arrow table, converting columns on access"""
+    
+    def __init__(self, table):
+        self._table = table
+    
+    def __getitem__(self, name):
+        if name not in self._table.column_names:
+            raise KeyError(name)
+        return self._table.column(name).to_pylist()
+    
+    def __iter__(self):
+        return iter(self._table.column_names)
+    
+    def __len__(self):
+        return self._table.num_columns
+
+def _arrow_passing_rows(field_lower: str, column, selected_regulation: Dict = None):
+    """
+    Arrow compute counterpart of _passing_rows
+    
+    Python regex patterns are run by Arrow's RE2 engine, whose \\d and \\s only match ASCII, so a
+    value RE2 accepts is always accepted by the re pattern as well.
+    
+    Args:
+        field_lower: Field name in lowercase
+        column: pyarrow string ChunkedArray
+        selected_regulation: Regulation information
+        
+    Returns:
+        Boolean array (True where the value is valid), or None if the field has no Arrow-native check
+    """
+    rule = _passing_rule(field_lower, selected_regulation)
+    stripped = pc.utf8_trim(column, characters=PYTHON_WHITESPACE)
+    
+    if field_lower == 'email':
+        passing = pc.match_substring_regex(stripped, EMAIL_PATTERN.pattern)
+        # The text between the first and second '@', as str.split('@')[1] gives it
+        domains = pc.struct_field(pc.extract_regex(pc.utf8_lower(stripped), r'^[^@]*@(?P<domain>[^@]*)'), [0])
+        passing = pc.and_(passing, pc.string_is_ascii(domains))
+        passing = pc.and_(passing, pc.invert(pc.is_in(domains, value_set=pa.array(sorted(DISPOSABLE_EMAIL_DOMAINS)))))
+    elif field_lower == 'address':
+        passing = pc.and_(pc.not_equal(stripped, ''),
+                          pc.invert(pc.match_substring_regex(column, LINE_BREAK_PATTERN.pattern)))
+    elif field_lower in ASCII_CODE_RULES:
+        allowed, min_length, max_length = ASCII_CODE_RULES[field_lower]
+        passing = pc.match_substring_regex(stripped, f'^[{re.escape(allowed)}]{{{min_length},{max_length}}}$')
+    elif rule is not None:
+        pattern, case, min_length, max_length = rule
+        cased = pc.utf8_upper(stripped) if case == 'upper' else pc.utf8_lower(stripped) if case == 'lower' else stripped
+        passing = pc.match_substring_regex(cased, pattern.pattern)
+        
+        lengths = pc.utf8_length(stripped)
+        passing = pc.and_(passing, pc.greater_equal(lengths, min_length))
+        if max_length is not None:
+            passing = pc.and_(passing, pc.less_equal(lengths, max_length))
+    else:
+        return None
+    
+    return pc.fill_null(passing, False).to_numpy()
+
+def _assemble_errors(codes: List[Any], error_positions: List[np.ndarray],
+                     error_records: List[np.ndarray], n_rows: int) -> Tuple[List[bool], List[List[Dict]]]:
+    """
+    Distribute collected errors into per-row lists, filling in each row's code
+    
+    Args:
+        codes: Code value per row (a list, or a dict keyed by the positions that have errors)
+        error_positions: Row positions of each batch of errors, in check order
+        error_records: validation_error records (without code) of each batch of errors
+        n_rows: Number of rows
+        
+    Returns:
+        Tuple of (valid flag per row, list of validation_error records per row)
+    """
+    errors_per_row = [[] for _ in range(n_rows)]
+    if not error_positions:
+        return [True] * n_rows, errors_per_row
+    
+    positions = np.concatenate(error_positions)
+    records = np.concatenate(error_records)
+    
+    # Batches are in check order, so appending batch after batch keeps each row's errors in order.
+    # Records are shared by all rows with the same value, so each row gets its own copy
+    for position, record in zip(positions.tolist(), records.tolist()):
+        errors_per_row[position].append(dict(record, code=codes[position]))
+    
+    valid_mask = (np.bincount(positions, minlength=n_rows) == 0).tolist()
+    return valid_mask, errors_per_row
+
+LANGUAGE_COUNTRY_PAIRS = frozenset(
+    (language, country) for language, countries in LANGUAGE_COUNTRIES.items() for country in countries
+)
+
+def _address_errors(addresses: List[Any], cities: List[Any]) -> List[Tuple[int, str]]:
+    """Column-wise validate_address_fields: (position, message) for rows with only one of address/city"""
+    has_address = pd.Series(addresses, dtype=object).astype(bool).to_numpy()
+    has_city = pd.Series(cities, dtype=object).astype(bool).to_numpy()
+    
+    errors = [(position, "Address provided but city is missing")
+              for position in np.flatnonzero(has_address & ~has_city).tolist()]
+    errors += [(position, "City provided but address is missing")
+               for position in np.flatnonzero(has_city & ~has_address).tolist()]
+    errors.sort(key=lambda error: error[0])
+    return errors
+
+def _language_country_errors(languages: List[Any], countries: List[Any]) -> List[Tuple[int, str]]:
+    """Column-wise validate_language_country_consistency: (position, message) for each mismatch"""
+    raw_languages = pd.Series(languages, dtype=object)
+    raw_countries = pd.Series(countries, dtype=object)
+    
+    normalized_languages = raw_languages.astype(str).str.strip().str.lower()
+    normalized_countries = raw_countries.astype(str).str.strip().str.upper()
+    
+    pairs = pd.MultiIndex.from_arrays([normalized_languages, normalized_countries])
+    mismatched = (
+        raw_languages.astype(bool) & raw_countries.astype(bool) &
+        normalized_languages.isin(LANGUAGE_COUNTRIES) & ~pairs.isin(LANGUAGE_COUNTRY_PAIRS)
+    )
+    
+    return [
+        (position, f"Language '{normalized_languages.iat[position]}' not typically used "
+                   f"in country '{normalized_countries.iat[position]}'")
+        for position in np.flatnonzero(mismatched.to_numpy(dtype=bool)).tolist()
+    ]
+
+def _passing_rows(field_lower: str, values: List[Any], selected_regulation: Dict = None):
+    """
+    Find, with vectorized string operations, the rows whose value certainly passes validation
+    
+    Args:
+        field_lower: Field name in lowercase
+        values: Column values
+        selected_regulation: Regulation information
+        
+    Returns:
+        Boolean array (True where the value is valid), or None if the field has no vectorized check
+    """
+    rule = _passing_rule(field_lower, selected_regulation)
+    
+    series = pd.Series(values, dtype=object)
+    # str() would turn None/NaN into 'None'/'nan', which can look valid; leave them to the scalar validators
+    present = series.notna().to_numpy(dtype=bool)
+    raw = series.astype(str)
+    stripped = raw.str.strip()
+    
+    if field_lower == 'email':
+        passing = stripped.str.match(EMAIL_PATTERN)
+        domains = stripped.str.lower().str.split('@').str[1]
+        return (passing & ~domains.isin(DISPOSABLE_EMAIL_DOMAINS)).to_numpy(dtype=bool) & present
+    
+    if field_lower == 'address':
+        return ((stripped != '') & ~raw.str.contains(LINE_BREAK_PATTERN)).to_numpy(dtype=bool) & present
+    
+    if field_lower in ('birthdate', 'signupdate'):
+        dates = _first_format_dates(stripped, '%d/%m/%Y')
+        today = pd.Timestamp(datetime.today()).normalize()
+        if field_lower == 'birthdate':
+            # Keep clear of the 18th birthday; leap days and the time of day are left to is_invalid_birthdate
+            cutoff = today - pd.DateOffset(years=18, days=2)
+        else:
+            cutoff = today
+        return (dates <= cutoff).to_numpy(dtype=bool) & present
+    
+    if field_lower in ASCII_CODE_RULES:
+        return _ascii_code_passing(stripped, *ASCII_CODE_RULES[field_lower]) & present
+    
+    if rule is None:
+        return None
+    
+    pattern, case, min_length, max_length = rule
+    cased = stripped.str.upper() if case == 'upper' else stripped.str.lower() if case == 'lower' else stripped
+    passing = cased.str.match(pattern)
+    
+    lengths = stripped.str.len()
+    passing &= lengths >= min_length
+    if max_length is not None:
+        passing &= lengths <= max_length
+    
+    return passing.to_numpy(dtype=bool) & present
+
+def _passing_rule(field_lower: str, selected_regulation: Dict = None):
+    """
+    PASSING_VALUE_RULES entry of a field, adding the generic zip and personal ID rules
+    where the regulation has no validator of its own (or reuses the default one)
+    
+    Args:
+        field_lower: Field name in lowercase
+        selected_regulation: Regulation information
+        
+    Returns:
+        (pattern, case, min length, max length) tuple, or None
+    """
+    rule = PASSING_VALUE_RULES.get(field_lower)
+    if rule is not None or (field_lower not in ZIP_FIELDS and field_lower != 'personalid'):
+        return rule
+    
+    regulation_name = selected_regulation.get('name') if selected_regulation else None
+    regulation = validator_registry.resolve_regulation(regulation_name)
+    
+    if field_lower in ZIP_FIELDS and not regulation['zip']:
+        return (ZIP_CODE_PATTERN, None, 1, None)
+    if field_lower == 'personalid' and regulation['personalid'] in (None, validate_personalid):
+        return (PERSONAL_ID_PATTERN, None, 5, 20)
+    return None
+
+def _ascii_code_passing(stripped: pd.Series, allowed: str, min_length: int, max_length: int) -> np.ndarray:
+    """
+    Check short codes character by character on a fixed-width code point matrix
+    
+    Args:
+        stripped: Stripped string values
+        allowed: ASCII characters a code may consist of
+        min_length: Minimum code length
+        max_length: Maximum code length
+        
+    Returns:
+        Boolean array, True where the value has an allowed length and only allowed characters
+    """
+    lengths = stripped.str.len().to_numpy()
+    if not len(lengths):
+        return np.zeros(0, dtype=bool)
+    
+    # Anything past max_length fails on length anyway, so cap the matrix width there
+    cells = stripped.str.slice(0, max_length).to_numpy(dtype=f'U{max_length}')
+    code_points = cells.view(np.uint32).reshape(len(cells), max_length)
+    
+    allowed_table = np.zeros(128, dtype=bool)
+    allowed_table[[ord(char) for char in allowed]] = True
+    cell_ok = (code_points < 128) & allowed_table[np.minimum(code_points, 127)]
+    
+    in_code = np.arange(max_length) < lengths[:, None]
+    return ((cell_ok | ~in_code).all(axis=1) & (lengths >= min_length) & (lengths <= max_length))
+
+def _first_format_dates(stripped: pd.Series, date_format: str) -> pd.Series:
+    """
+    Parse a column with the first format the scalar date validators try, all at once
+    
+    Args:
+        stripped: Stripped string values
+        date_format: Key of DATE_FORMAT_PATTERNS
+        
+    Returns:
+        Datetime Series, NaT where the format does not give a real date
+    """
+    pattern = DATE_FORMAT_PATTERNS[date_format]
+    matched = stripped[stripped.str.match(pattern) & stripped.map(str.isascii)]
+    parts = matched.str.extract(pattern)
+    
+    dates = pd.to_datetime(pd.DataFrame({
+        'year': parts['Y'].astype(int),
+        'month': parts['m'].astype(int),
+        'day': parts['d'].str.strip().astype(int)
+    }), errors='coerce')
+    return dates.reindex(stripped.index)
+
+def _map_unique(func, *columns) -> List[Any]:
+    """Apply func to each row of the given columns, evaluating it once per distinct combination"""
+    results = {}
+    mapped = []
+    for key in zip(*columns):
+        try:
+            result = results[key]
+        except KeyError:
+            result = results[key] = func(*key)
+        mapped.append(result)
+    return mapped
+
+def _validate_person_name(name):
+    """Check a first or last name: allowed characters first, then length"""
+    return validate_name(name) or validate_name_length(name, 1, 50)
+
+# Fields validated from their value alone: field -> (validator, label prefixed to its error or None)
+FIELD_VALIDATORS = {
+    'email': (enhanced_email_validation, None),
+    'birthdate': (is_invalid_birthdate, 'Birthdate'),
+    'phone': (validate_phone_number, 'phone'),
+    'cellphone': (validate_phone_number, 'cellphone'),
+    'firstname': (_validate_person_name, None),
+    'lastname': (_validate_person_name, None),
+    'regioncode': (validate_regioncode, 'regioncode'),
+    'provincecode': (validate_provincecode, 'provincecode'),
+    'province': (validate_province, 'province'),
+    'idcardno': (validate_idcardno, 'idcardno'),
+    'citizenship': (validate_citizenship, 'citizenship'),
+    'signupdate': (validate_signup_date, 'signupdate'),
+    'address': (check_for_crlf, 'address'),
+    'countrycode': (validate_country_code, 'countrycode'),
+    'signuplanguagecode': (validate_language_code, 'signuplanguagecode'),
+    'currencycode': (validate_currency_code, 'currencycode')
+}
+
+def _field_context(field_lower: str, selected_regulation: Dict = None) -> Tuple:
+    """Return the other row fields a field's validation reads"""
+    if field_lower != 'personalid':
+        return ()
+    
+    context = ['citizenship']
+    regulation_name = selected_regulation.get('name') if selected_regulation else None
+    depends_on = validator_registry.resolve_regulation(regulation_name)['personalid_depends_on']
+    if depends_on and depends_on not in context:
+        context.append(depends_on)
+    
+    return tuple(context)
+
+def _field_error(field: str, field_lower: str, value: Any, row_data: Dict, 
+                 selected_regulation: Dict = None) -> Dict:
+    """
+    Check one required field of a row
+    
+    Args:
+        field: Field name as it appears in the row
+        field_lower: Field name in lowercase
+        value: Field value to validate
+        row_data: Row data (only the fields listed by _field_context are read)
+        selected_regulation: Regulation information
+        
+    Returns:
+        validation_error record (code left for the caller to fill in) if invalid, None if valid
+    """
+    value_str = str(value).strip()
+    
+    if (field_lower == 'personalid' and 
+        selected_regulation and selected_regulation.get('name') == 'Peru'):
+        citizenship = row_data.get('citizenship', '')
+        if not value_str:
+            if str(citizenship).strip().upper() == 'ES':
+                error_msg = f"{field} is required for Spanish residents"
+                return validation_error(None, field, error_msg, error_msg, value)
+            return None
+    elif not value_str:
+        error_msg = f"{field} is required but missing"
+        return validation_error(None, field, error_msg, error_msg, value)
+    
+    error = _validate_field(field_lower, value, row_data, selected_regulation)
+    if error:
+        # Same text as enhance_error_with_value, reusing the stripped value
+        return validation_error(None, field, error, f"{field}: {error}: '{value_str}'", value)
+    
+    return None
+
+def _cross_field_error(field: str, message: str) -> Dict:
+    """validation_error record (without code) for a cross-field check message, None if there is none"""
+    return validation_error(None, field, message, message) if message else None
+
 def _validate_field(field_lower: str, value: Any, row_data: Dict, 
                    selected_regulation: Dict = None) -> str:
     """
@@ -109,61 +675,23 @@ def _validate_field(field_lower: str, value: Any, row_data: Dict,
     Returns:
         Error message if invalid, None if valid
     """
-    if field_lower == 'email':
-        return enhanced_email_validation(value)
-    
-    elif field_lower == 'birthdate':
-        birthdate_error = is_invalid_birthdate(value)
-        if birthdate_error:
-            return f"Birthdate: {birthdate_error}"
-    
-    elif field_lower in ['phone', 'cellphone']:
-        phone_error = validate_phone_number(value)
-        if phone_error:
-            return f"{field_lower}: {phone_error}"
-    
-    elif field_lower == 'firstname':
-        name_error = validate_name(value)
-        if name_error:
-            return name_error
-        
-        length_error = validate_name_length(value, 1, 50)
-        if length_error:
-            return length_error
-    
-    elif field_lower == 'lastname':
-        name_error = validate_name(value)
-        if name_error:
-            return name_error
-        
-        length_error = validate_name_length(value, 1, 50)
-        if length_error:
-            return length_error
-    
-    elif field_lower == 'regioncode':
-        regioncode_error = validate_regioncode(value)
-        if regioncode_error:
-            return f"regioncode: {regioncode_error}"
-    
-    elif field_lower == 'provincecode':
-        provincecode_error = validate_provincecode(value)
-        if provincecode_error:
-            return f"provincecode: {provincecode_error}"
-    
-    elif field_lower == 'province':
-        province_error = validate_province(value)
-        if province_error:
-            return f"province: {province_error}"
-    
-    elif field_lower == 'personalid':
+    simple_validator = FIELD_VALIDATORS.get(field_lower)
+    if simple_validator is not None:
+        validator, label = simple_validator
+        error = validator(value)
+        if error and label:
+            return f"{label}: {error}"
+        return error
+    
+    if field_lower == 'personalid':
         # Use validator registry for regulation-specific validation
         regulation_name = selected_regulation.get('name') if selected_regulation else None
-        personalid_validator = validator_registry.get_validator(regulation_name, 'personalid')
+        regulation = validator_registry.resolve_regulation(regulation_name)
+        personalid_validator = regulation['personalid']
         
         if personalid_validator:
-            conditional_info = validator_registry.has_conditional_validation(regulation_name, 'personalid')
-            if conditional_info and conditional_info.get('conditional'):
-                depends_on = conditional_info.get('depends_on')
+            if regulation['personalid_conditional']:
+                depends_on = regulation['personalid_depends_on']
                 dependency_value = row_data.get(depends_on, '') if depends_on else ''
                 personalid_error = personalid_validator(value, dependency_value)
             else:
@@ -174,34 +702,9 @@ def _validate_field(field_lower: str, value: Any, row_data: Dict,
         if personalid_error:
             return f"personalid: {personalid_error}"
     
-    elif field_lower == 'idcardno':
-        idcardno_error = validate_idcardno(value)
-        if idcardno_error:
-            return f"idcardno: {idcardno_error}"
-    
-    elif field_lower == 'citizenship':
-        citizenship_error = validate_citizenship(value)
-        if citizenship_error:
-            return f"citizenship: {citizenship_error}"
-    
-    elif field_lower == 'signupdate':
-        signup_date_error = validate_signup_date(value)
-        if signup_date_error:
-            return f"signupdate: {signup_date_error}"
-    
-    elif field_lower == 'address':
-        crlf_error = check_for_crlf(value)
-        if crlf_error:
-            return f"address: {crlf_error}"
-    
-    elif field_lower == 'countrycode':
-        country_error = validate_country_code(value)
-        if country_error:
-            return f"countrycode: {country_error}"
-    
-    elif field_lower in ['zipcode', 'postalcode', 'zip', 'postcode']:
+    elif field_lower in ZIP_FIELDS:
         regulation_name = selected_regulation.get('name') if selected_regulation else None
-        zip_validator = validator_registry.get_validator(regulation_name, 'zip')
+        zip_validator = validator_registry.resolve_regulation(regulation_name)['zip']
         
         if zip_validator:
             zip_error = zip_validator(value)
@@ -211,19 +714,9 @@ def _validate_field(field_lower: str, value: Any, row_data: Dict,
         if zip_error:
             return f"{field_lower}: {zip_error}"
     
-    elif field_lower == 'signuplanguagecode':
-        lang_error = validate_language_code(value)
-        if lang_error:
-            return f"signuplanguagecode: {lang_error}"
-    
-    elif field_lower == 'currencycode':
-        currency_error = validate_currency_code(value)
-        if currency_error:
-            return f"currencycode: {currency_error}"
-    
     return None
 
-def _validate_cross_fields(row_data: Dict, selected_regulation: Dict = None) -> List[str]:
+def _validate_cross_fields(row_data: Dict, selected_regulation: Dict = None) -> List[Dict]:
     """
     Validate cross-field relationships
     
@@ -232,23 +725,23 @@ def _validate_cross_fields(row_data: Dict, selected_regulation: Dict = None) ->
         selected_regulation: Regulation information
         
     Returns:
-        List of error messages
+        List of validation_error records (without code)
     """
     errors = []
     
     address_errors = validate_address_fields(row_data)
-    errors.extend(address_errors)
+    errors.extend(_cross_field_error('address', error) for error in address_errors)
     
     language_country_errors = validate_language_country_consistency(row_data)
-    errors.extend(language_country_errors)
+    errors.extend(_cross_field_error('languagecode', error) for error in language_country_errors)
     
     if selected_regulation:
         regulation_name = selected_regulation.get('name')
-        document_validator = validator_registry.get_validator(regulation_name, 'documents')
+        document_validator = validator_registry.resolve_regulation(regulation_name)['documents']
         if document_validator:
             doc_error = document_validator(row_data)
             if doc_error:
-                errors.append(doc_error)
+                errors.append(_cross_field_error('documents', doc_error))
     
     return errors
 
@@ -265,21 +758,11 @@ def find_duplicates_parallel(data_chunk: List[Dict], field_name: str,
     Returns:
         Dictionary mapping values to lists of row indices
     """
-    value_indices = {}
-    
-    for idx, row in enumerate(data_chunk):
-        if field_name not in row or not row[field_name]:
-            continue
-        
-        value = str(row[field_name]).strip().lower()
-        if not value:
-            continue
-        
-        global_idx = start_index + idx
-        
-        if value in value_indices:
-            value_indices[value].append(global_idx)
-        else:
-            value_indices[value] = [global_idx]
-    
-    return {value: indices for value, indices in value_indices.items() if len(indices) > 1}
+    values = pd.Series([row.get(field_name) for row in data_chunk], dtype=object)
+    normalized = values[values.astype(bool)].astype(str).str.strip().str.lower()
+    normalized = normalized[normalized != '']
+    repeated = normalized[normalized.duplicated(keep=False)]
+    
+    row_indices = repeated.index.to_numpy() + start_index
+    return {value: row_indices[positions].tolist()
+            for value, positions in repeated.groupby(repeated, sort=False).indices.items()}
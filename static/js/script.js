@@ -20,9 +20,20 @@ let state = {
         'signuplanguagecode', 'currencycode', 'zip', 'signupdate'
     ],
     selectedRegulation: null,
-    requiredFields: null
+    requiredFields: null,
+    validationToken: null
 };
 
+/**
+ * Add the validation token header so the server can find this client's state
+ */
+function withValidationToken(headers = {}) {
+    if (state.validationToken) {
+        headers['X-Validation-Token'] = state.validationToken;
+    }
+    return headers;
+}
+
 document.addEventListener('DOMContentLoaded', () => {
     // Initialize regulation selector first
     initRegulationSelector();
@@ -235,6 +246,7 @@ function handleFileUpload(event) {
     
     fetch('/upload', {
         method: 'POST',
+        headers: withValidationToken(),
         body: formData
     })
     .then(response => {
@@ -249,6 +261,7 @@ function handleFileUpload(event) {
         elements.loadingIndicator.classList.add('d-none');
         
         state.fileData = data;
+        state.validationToken = data.validation_token;
         
         displayFileInfo(data, file.name, requiredColumns);
         
@@ -533,6 +546,7 @@ function handleApplyMappings() {
     
     fetch('/upload', {
         method: 'POST',
+        headers: withValidationToken(),
         body: formData
     })
     .then(response => {
@@ -547,6 +561,7 @@ function handleApplyMappings() {
         elements.loadingIndicator.classList.add('d-none');
         
         state.fileData = data;
+        state.validationToken = data.validation_token;
         
         showSuccess("File uploaded with column mappings applied!");
         
@@ -617,9 +632,9 @@ function handleValidation() {
     
     fetch('/validate', {
         method: 'POST',
-        headers: {
+        headers: withValidationToken({
             'Content-Type': 'application/json'
-        },
+        }),
         body: JSON.stringify(requestData)
     })
     .then(response => {
@@ -633,6 +648,7 @@ function handleValidation() {
     .then(data => {
         elements.loadingIndicator.classList.add('d-none');
         
+        state.validationToken = data.validation_token || state.validationToken;
         displayValidationResults(data);
     })
     .catch(error => {
@@ -745,9 +761,10 @@ function displayValidationResults(data) {
             `;
             
             result.errors.forEach(error => {
-                const isDuplicateEmail = error.toLowerCase().includes('duplicate email');
+                const errorText = `${error.code} ${error.message}`;
+                const isDuplicateEmail = errorText.toLowerCase().includes('duplicate email');
                 invalidRowsHTML += `
-                    <li ${isDuplicateEmail ? 'class="text-danger fw-bold"' : ''}>${error}</li>
+                    <li ${isDuplicateEmail ? 'class="text-danger fw-bold"' : ''}>${errorText}</li>
                 `;
             });
             
@@ -795,9 +812,9 @@ function downloadErrorsCSV() {
     
     fetch('/download-errors', {
         method: 'GET',
-        headers: {
+        headers: withValidationToken({
             'Content-Type': 'application/json',
-        }
+        })
     })
     .then(response => {
         if (!response.ok) {
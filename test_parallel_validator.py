@@ -0,0 +1,52 @@
+import random
+import unittest
+
+import pandas as pd
+
+from app import REGULATIONS
+from parallel_validator import validate_columns, validate_single_row
+
+# Missing and blank cells next to a few valid and invalid values, so every field sees both paths
+SAMPLE_VALUES = [
+    None, None, float('nan'), '', ' ', 'None', 'nan',
+    'Ann', 'José María', 'Bob1', 'ES', 'US', 'es', 'USD', '12345', 'LIMA01', 'A1-b',
+    'a@b.com', 'x@tempmail.org', 'addr 1', 'line\nbreak', '+51 123 456 789',
+    '12345678Z', 'X1234567L', '01/02/2000', '31/12/2020'
+]
+
+FIELDS = [
+    'firstname', 'lastname', 'email', 'birthdate', 'address', 'city', 'phone', 'cellphone',
+    'countrycode', 'signuplanguagecode', 'currencycode', 'zip', 'signupdate', 'citizenship',
+    'regioncode', 'provincecode', 'province', 'personalid', 'idcardno', 'languagecode', 'passportid'
+]
+
+class ValidateColumnsEquivalenceTest(unittest.TestCase):
+    """validate_columns must give every row the same result as validate_single_row"""
+
+    def setUp(self):
+        rng = random.Random(7)
+        self.rows = [
+            dict({'code': f'C{index}'}, **{field: rng.choice(SAMPLE_VALUES) for field in FIELDS})
+            for index in range(2000)
+        ]
+        self.df = pd.DataFrame(self.rows, dtype=object)
+
+    def assert_equivalent(self, required_columns, regulation_info):
+        valid_mask, errors_per_row = validate_columns(self.df, required_columns, regulation_info)
+
+        for index, row in enumerate(self.rows):
+            expected = validate_single_row(row, index, required_columns, regulation_info)
+            self.assertEqual(expected['valid'], valid_mask[index], row)
+            self.assertCountEqual(expected['errors'], errors_per_row[index], row)
+
+    def test_without_regulation(self):
+        self.assert_equivalent(['code'] + FIELDS, None)
+
+    def test_regulations(self):
+        for regulation in REGULATIONS.values():
+            with self.subTest(regulation=regulation['name']):
+                regulation_info = {'regulation': regulation, 'name': regulation['name']}
+                self.assert_equivalent(regulation['required_fields'], regulation_info)
+
+if __name__ == '__main__':
+    unittest.main()
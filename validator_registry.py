@@ -1,18 +1,18 @@
 import importlib
 from validators_common import *
-from validators_peru import validate_peru_personalid, validate_peru_documents, validate_peru_zip
-from validators_colombia import validate_colombia_personalid
-from validators_ims import validate_ims_personalid
 
 class ValidatorRegistry:
     """Registry for managing regulation-specific validators"""
     
     def __init__(self):
+        # Built-in validators are (module, function) names, imported the first time they are used
         self.regulation_validators = {
             'Peru': {
-                'personalid': validate_peru_personalid,
-                'documents': validate_peru_documents,
-                'zip': validate_peru_zip,
+                'personalid': ('validators_peru', 'validate_peru_personalid'),
+                'documents': ('validators_peru', 'validate_peru_documents'),
+                # Column-wise counterpart of 'documents', used when validating whole columns
+                'document_columns': ('validators_peru', 'validate_peru_document_columns'),
+                'zip': ('validators_peru', 'validate_peru_zip'),
                 'conditional_fields': {
                     'personalid': {
                         'conditional': True,
@@ -21,12 +21,14 @@ class ValidatorRegistry:
                 }
             },
             'Colombia': {
-                'personalid': validate_colombia_personalid,
+                'personalid': ('validators_colombia', 'validate_colombia_personalid'),
             },
             'IMS': {
-                'personalid': validate_ims_personalid,
+                'personalid': ('validators_ims', 'validate_ims_personalid'),
             }
         }
+        self._loaded = {}
+        self._resolved = {}
     
     def get_validator(self, regulation_name, validator_type):
         """
@@ -39,8 +41,18 @@ class ValidatorRegistry:
         Returns:
             Validator function or None if not found
         """
+        key = (regulation_name, validator_type)
+        if key in self._loaded:
+            return self._loaded[key]
+        
         regulation_validators = self.regulation_validators.get(regulation_name, {})
-        return regulation_validators.get(validator_type)
+        validator = regulation_validators.get(validator_type)
+        if isinstance(validator, tuple):
+            module_name, function_name = validator
+            validator = getattr(importlib.import_module(module_name), function_name)
+        
+        self._loaded[key] = validator
+        return validator
     
     def has_conditional_validation(self, regulation_name, field_name):
         """
@@ -57,6 +69,31 @@ class ValidatorRegistry:
         conditional_fields = regulation_validators.get('conditional_fields', {})
         return conditional_fields.get(field_name)
     
+    def resolve_regulation(self, regulation_name):
+        """
+        Resolve once the validators a regulation applies to every row
+        
+        Args:
+            regulation_name: Name of the regulation (or None)
+            
+        Returns:
+            Dictionary with 'personalid', 'zip', 'documents' and 'document_columns'
+            validators (or None), 'personalid_conditional' and 'personalid_depends_on'
+        """
+        resolved = self._resolved.get(regulation_name)
+        if resolved is None:
+            conditional_info = self.has_conditional_validation(regulation_name, 'personalid')
+            personalid_conditional = bool(conditional_info and conditional_info.get('conditional'))
+            resolved = self._resolved[regulation_name] = {
+                'personalid': self.get_validator(regulation_name, 'personalid'),
+                'personalid_conditional': personalid_conditional,
+                'personalid_depends_on': conditional_info.get('depends_on') if personalid_conditional else None,
+                'zip': self.get_validator(regulation_name, 'zip'),
+                'documents': self.get_validator(regulation_name, 'documents'),
+                'document_columns': self.get_validator(regulation_name, 'document_columns')
+            }
+        return resolved
+    
     def get_all_validators_for_regulation(self, regulation_name):
         """
         Get all validators for a specific regulation
@@ -67,7 +104,11 @@ class ValidatorRegistry:
         Returns:
             Dictionary of all validators for the regulation
         """
-        return self.regulation_validators.get(regulation_name, {})
+        return {
+            validator_type: (self.get_validator(regulation_name, validator_type)
+                             if validator_type != 'conditional_fields' else validator)
+            for validator_type, validator in self.regulation_validators.get(regulation_name, {}).items()
+        }
     
     def register_validator(self, regulation_name, validator_type, validator_func):
         """
@@ -82,5 +123,12 @@ class ValidatorRegistry:
             self.regulation_validators[regulation_name] = {}
         
         self.regulation_validators[regulation_name][validator_type] = validator_func
+        self._loaded.pop((regulation_name, validator_type), None)
+        
+        # A replaced row-wise documents check must not be shadowed by the built-in column-wise one
+        if validator_type == 'documents':
+            self.regulation_validators[regulation_name].pop('document_columns', None)
+            self._loaded.pop((regulation_name, 'document_columns'), None)
+        self._resolved.clear()
 
 validator_registry = ValidatorRegistry()
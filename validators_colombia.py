@@ -1,15 +1,5 @@
+from validators_common import validate_personalid
 
-def validate_colombia_personalid(personalid):
-    """
-    Validate Colombia-specific personal ID requirements
-    
-    Args:
-        personalid: The personal ID value
-        
-    Returns:
-        Error message if invalid, None if valid
-    """
-
-    from validators_common import validate_personalid
-    return validate_personalid(personalid)
-
+# Colombia applies the default personal ID rules unchanged, so its validator is the default one
+# itself; that saves a call frame per row and lets column-wise validation recognize it
+validate_colombia_personalid = validate_personalid
@@ -1,19 +1,105 @@
 import re
+from calendar import monthrange
 from datetime import datetime
 import logging
-from dateutil.relativedelta import relativedelta
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
 EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-áéíóúñÁÉÍÓÚÑ$]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
-CURRENCY_CODE_PATTERN = re.compile(r'^[A-Z]{3}$')
 PHONE_PATTERN = re.compile(r'^\+?\d[\d\s\-\(\)]{8,20}$')
-COUNTRY_CODE_PATTERN = re.compile(r'^[A-Z]{2}$')
-LANGUAGE_CODE_PATTERN = re.compile(r'^[a-z]{2}$')
 NAME_PATTERN = re.compile(r'^[a-zA-ZáéíóúñÁÉÍÓÚÑ\s\-\'\.]+$')
 ZIP_CODE_PATTERN = re.compile(r'^[a-zA-Z0-9\s\-]{3,10}$')
 REGION_PROVINCE_CODE_PATTERN = re.compile(r'^[A-Za-z0-9\-_]{1,10}$')
 PERSONAL_ID_PATTERN = re.compile(r'^[A-Za-z0-9\-\s]+$')
+LINE_BREAK_PATTERN = re.compile(r'[\r\n]')
+
+# Messages of each ID validator per _id_shape_problem result
+PERSONAL_ID_ERRORS = {
+    'short': "Personal ID too short",
+    'long': "Personal ID too long",
+    'invalid': "Personal ID contains invalid characters"
+}
+IDCARDNO_ERRORS = {
+    'short': "ID card number too short",
+    'long': "ID card number too long",
+    'invalid': "ID card number contains invalid characters"
+}
+
+# Codes have few distinct values, so their validators keep a larger memo
+CODE_CACHE_SIZE = 4096
+
+DISPOSABLE_EMAIL_DOMAINS = frozenset({'tempmail.org', '10minutemail.com', 'guerrillamail.com'})
+
+LANGUAGE_COUNTRIES = {
+    'es': frozenset({'ES', 'MX', 'AR', 'CO', 'PE', 'CL', 'VE'}),
+    'en': frozenset({'US', 'GB', 'CA', 'AU', 'NZ'}),
+    'fr': frozenset({'FR', 'CA', 'BE', 'CH'}),
+    'de': frozenset({'DE', 'AT', 'CH'}),
+    'it': frozenset({'IT', 'CH'}),
+    'pt': frozenset({'PT', 'BR'})
+}
+
+_DAY = r'(?P<d>3[01]|[12]\d|0[1-9]|[1-9]| [1-9])'
+_MONTH = r'(?P<m>1[0-2]|0[1-9]|[1-9])'
+_YEAR = r'(?P<Y>\d\d\d\d)'
+
+# Same digit groups datetime.strptime uses for %d, %m and %Y
+DATE_FORMAT_PATTERNS = {
+    '%d/%m/%Y': re.compile(_DAY + '/' + _MONTH + '/' + _YEAR + '$', re.IGNORECASE),
+    '%m/%d/%Y': re.compile(_MONTH + '/' + _DAY + '/' + _YEAR + '$', re.IGNORECASE),
+    '%Y-%m-%d': re.compile(_YEAR + '-' + _MONTH + '-' + _DAY + '$', re.IGNORECASE)
+}
+DATE_FORMAT_SEPARATORS = {'%d/%m/%Y': '/', '%m/%d/%Y': '/', '%Y-%m-%d': '-'}
+
+def _parse_date(date_str, date_formats):
+    """
+    Parse a date string with the first matching format, without going through strptime
+    
+    Args:
+        date_str: Stripped date string
+        date_formats: Formats to try in order (keys of DATE_FORMAT_PATTERNS)
+        
+    Returns:
+        datetime for the first format that yields a real date, or None
+    """
+    for date_format in date_formats:
+        # A format whose separator is absent cannot match, so skip its regex
+        if DATE_FORMAT_SEPARATORS[date_format] not in date_str:
+            continue
+        found = DATE_FORMAT_PATTERNS[date_format].match(date_str)
+        if found is None:
+            continue
+        try:
+            return datetime(int(found['Y']), int(found['m']), int(found['d']))
+        except ValueError:
+            continue
+    return None
+
+def _id_shape_problem(id_value):
+    """
+    Shape check shared by the personal ID and ID card validators
+    
+    Args:
+        id_value: Stripped ID string
+        
+    Returns:
+        'short', 'long' or 'invalid', or None if the ID has 5-20 allowed characters
+    """
+    if len(id_value) < 5:
+        return 'short'
+    
+    if len(id_value) > 20:
+        return 'long'
+    
+    if not PERSONAL_ID_PATTERN.match(id_value):
+        return 'invalid'
+    
+    return None
+
+def _is_ascii_letters(code, length):
+    """Same result as matching ^[A-Za-z]{length}$ against a stripped value, without the regex engine"""
+    return len(code) == length and code.isascii() and code.isalpha()
 
 def is_valid_email(email):
     """Check if the email has a valid format"""
@@ -25,11 +111,12 @@ def is_valid_email(email):
     if '@' not in email:
         return "Email missing @ symbol"
     
-    if not EMAIL_PATTERN.match(email):
+    if '.' not in email.rpartition('@')[2] or not EMAIL_PATTERN.match(email):
         return "Email has invalid format"
     
     return None
 
+@lru_cache(maxsize=CODE_CACHE_SIZE)
 def validate_currency_code(code):
     """Check if the currency code is a valid format"""
     if code is None or code == '':
@@ -37,11 +124,12 @@ def validate_currency_code(code):
     
     code = str(code).strip().upper()
     
-    if not CURRENCY_CODE_PATTERN.match(code):
+    if not _is_ascii_letters(code, 3):
         return "Not a valid format (should be 3 uppercase letters)"
     
     return None
 
+@lru_cache(maxsize=512)
 def is_invalid_birthdate(birthdate_str, age_limit=18):
     """Check if birthdate is invalid or represents someone underage"""
     if birthdate_str is None or birthdate_str == '':
@@ -49,29 +137,25 @@ def is_invalid_birthdate(birthdate_str, age_limit=18):
     
     birthdate_str = str(birthdate_str).strip()
     
-    date_formats = ['%d/%m/%Y', '%m/%d/%Y'] 
+    birthdate = _parse_date(birthdate_str, ('%d/%m/%Y', '%m/%d/%Y'))
+    if birthdate is None:
+        return "Invalid birthdate format"
     
-    for date_format in date_formats:
-        try:
-            birthdate = datetime.strptime(birthdate_str, date_format)
-            today = datetime.today()
-            
-            if birthdate > today:
-                return "Birthdate is in the future"
-            
-            age_delta = relativedelta(today, birthdate)
-            age = age_delta.years
-            
-            if age < age_limit:
-                return f"Account holder is underage (age: {age})"
-            
-            return None
-            
-        except ValueError:
-            continue
+    today = datetime.today()
+    
+    if birthdate > today:
+        return "Birthdate is in the future"
+    
+    # A 29 February birthday falls on 28 February in common years
+    birthday = (birthdate.month, min(birthdate.day, monthrange(today.year, birthdate.month)[1]))
+    age = today.year - birthdate.year - ((today.month, today.day) < birthday)
     
-    return "Invalid birthdate format"
+    if age < age_limit:
+        return f"Account holder is underage (age: {age})"
+    
+    return None
 
+@lru_cache(maxsize=512)
 def validate_phone_number(phone):
     """Check if the phone number is a valid format"""
     if phone is None or phone == '':
@@ -95,6 +179,7 @@ def check_for_crlf(value):
     
     return None
 
+@lru_cache(maxsize=CODE_CACHE_SIZE)
 def validate_country_code(code):
     """Check if the country code is a valid format"""
     if code is None or code == '':
@@ -102,11 +187,12 @@ def validate_country_code(code):
     
     code = str(code).strip().upper()
     
-    if not COUNTRY_CODE_PATTERN.match(code):
+    if not _is_ascii_letters(code, 2):
         return "Country code must be 2 uppercase letters"
     
     return None
 
+@lru_cache(maxsize=CODE_CACHE_SIZE)
 def validate_language_code(code):
     """Check if the language code is a valid format"""
     if code is None or code == '':
@@ -114,11 +200,12 @@ def validate_language_code(code):
     
     code = str(code).strip().lower()
     
-    if not LANGUAGE_CODE_PATTERN.match(code):
+    if not _is_ascii_letters(code, 2):
         return "Language code must be 2 lowercase letters"
     
     return None
 
+@lru_cache(maxsize=512)
 def validate_name(name, max_length=50):
     """Check if the name is valid"""
     if name is None or name == '':
@@ -134,6 +221,7 @@ def validate_name(name, max_length=50):
     
     return None
 
+@lru_cache(maxsize=512)
 def validate_signup_date(signup_date_str):
     """Check if signup date is valid and not in the future"""
     if signup_date_str is None or signup_date_str == '':
@@ -141,23 +229,16 @@ def validate_signup_date(signup_date_str):
     
     signup_date_str = str(signup_date_str).strip()
     
-    date_formats = ['%d/%m/%Y', '%m/%d/%Y', '%Y-%m-%d']
+    signup_date = _parse_date(signup_date_str, ('%d/%m/%Y', '%m/%d/%Y', '%Y-%m-%d'))
+    if signup_date is None:
+        return "Invalid signup date format"
     
-    for date_format in date_formats:
-        try:
-            signup_date = datetime.strptime(signup_date_str, date_format)
-            today = datetime.today()
-            
-            if signup_date > today:
-                return "Signup date is in the future"
-            
-            return None
-            
-        except ValueError:
-            continue
+    if signup_date > datetime.today():
+        return "Signup date is in the future"
     
-    return "Invalid signup date format"
+    return None
 
+@lru_cache(maxsize=512)
 def validate_name_length(name, min_length=1, max_length=50):
     """Check if the name length is within acceptable bounds"""
     if name is None or name == '':
@@ -173,6 +254,7 @@ def validate_name_length(name, min_length=1, max_length=50):
     
     return None
 
+@lru_cache(maxsize=CODE_CACHE_SIZE)
 def validate_zip_code(zip_code):
     """Check if the zip code is valid"""
     if zip_code is None or zip_code == '':
@@ -210,21 +292,13 @@ def validate_language_country_consistency(row):
         language = str(language).strip().lower()
         country = str(country).strip().upper()
         
-        language_country_map = {
-            'es': ['ES', 'MX', 'AR', 'CO', 'PE', 'CL', 'VE'],
-            'en': ['US', 'GB', 'CA', 'AU', 'NZ'],
-            'fr': ['FR', 'CA', 'BE', 'CH'],
-            'de': ['DE', 'AT', 'CH'],
-            'it': ['IT', 'CH'],
-            'pt': ['PT', 'BR']
-        }
-        
-        if language in language_country_map:
-            if country not in language_country_map[language]:
-                errors.append(f"Language '{language}' not typically used in country '{country}'")
+        countries = LANGUAGE_COUNTRIES.get(language)
+        if countries is not None and country not in countries:
+            errors.append(f"Language '{language}' not typically used in country '{country}'")
     
     return errors
 
+@lru_cache(maxsize=512)
 def enhanced_email_validation(email):
     """Enhanced email validation with additional checks"""
     basic_error = is_valid_email(email)
@@ -233,14 +307,14 @@ def enhanced_email_validation(email):
     
     email = str(email).strip().lower()
     
-    disposable_domains = ['tempmail.org', '10minutemail.com', 'guerrillamail.com']
     domain = email.split('@')[1]
     
-    if domain in disposable_domains:
+    if domain in DISPOSABLE_EMAIL_DOMAINS:
         return "Disposable email addresses are not allowed"
     
     return None
 
+@lru_cache(maxsize=CODE_CACHE_SIZE)
 def validate_citizenship(citizenship):
     """Check if the citizenship code is valid"""
     if citizenship is None or citizenship == '':
@@ -248,11 +322,12 @@ def validate_citizenship(citizenship):
     
     citizenship = str(citizenship).strip().upper()
     
-    if not COUNTRY_CODE_PATTERN.match(citizenship):
+    if not _is_ascii_letters(citizenship, 2):
         return "Citizenship must be 2 uppercase letters"
     
     return None
 
+@lru_cache(maxsize=CODE_CACHE_SIZE)
 def validate_regioncode(regioncode):
     """Check if the region code is valid"""
     if regioncode is None or regioncode == '':
@@ -265,6 +340,7 @@ def validate_regioncode(regioncode):
     
     return None
 
+@lru_cache(maxsize=CODE_CACHE_SIZE)
 def validate_provincecode(provincecode):
     """Check if the province code is valid"""
     if provincecode is None or provincecode == '':
@@ -277,6 +353,7 @@ def validate_provincecode(provincecode):
     
     return None
 
+@lru_cache(maxsize=512)
 def validate_province(province):
     """Check if the province name is valid"""
     if province is None or province == '':
@@ -295,38 +372,38 @@ def validate_province(province):
     
     return None
 
+@lru_cache(maxsize=512)
 def validate_personalid(personalid):
     """Default personal ID validation"""
     if personalid is None or personalid == '':
         return "Personal ID is empty"
     
-    personalid = str(personalid).strip()
-    
-    if len(personalid) < 5:
-        return "Personal ID too short"
-    
-    if len(personalid) > 20:
-        return "Personal ID too long"
-    
-    if not PERSONAL_ID_PATTERN.match(personalid):
-        return "Personal ID contains invalid characters"
-    
-    return None
+    return PERSONAL_ID_ERRORS.get(_id_shape_problem(str(personalid).strip()))
 
+@lru_cache(maxsize=512)
 def validate_idcardno(idcardno):
     """Check if the ID card number is valid"""
     if idcardno is None or idcardno == '':
         return "ID card number is empty"
     
-    idcardno = str(idcardno).strip()
-    
-    if len(idcardno) < 5:
-        return "ID card number too short"
-    
-    if len(idcardno) > 20:
-        return "ID card number too long"
-    
-    if not PERSONAL_ID_PATTERN.match(idcardno):
-        return "ID card number contains invalid characters"
-    
-    return None
+    return IDCARDNO_ERRORS.get(_id_shape_problem(str(idcardno).strip()))
+
+# Regulation modules are imported lazily and add their memoized validators via register_cached_validators
+_CACHED_VALIDATORS = [
+    validate_country_code, validate_currency_code, validate_language_code,
+    validate_zip_code, validate_phone_number, enhanced_email_validation,
+    is_invalid_birthdate, validate_signup_date, validate_citizenship,
+    validate_name, validate_personalid, validate_idcardno,
+    validate_regioncode, validate_provincecode, validate_province, validate_name_length
+]
+
+def register_cached_validators(*validators):
+    """Include lru_cache'd validators defined in other modules in clear_validator_caches"""
+    for validator in validators:
+        if validator not in _CACHED_VALIDATORS:
+            _CACHED_VALIDATORS.append(validator)
+
+def clear_validator_caches():
+    """Reset memoized validator results (date checks depend on the current day)"""
+    for validator in _CACHED_VALIDATORS:
+        validator.cache_clear()
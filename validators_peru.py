@@ -1,6 +1,23 @@
 import re
-from validators_common import validate_personalid
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from validators_common import _id_shape_problem, register_cached_validators, CODE_CACHE_SIZE
 
+# DNI (8 digits + letter) or NIE (X/Y/Z + 7 digits + letter)
+SPANISH_ID_PATTERN = re.compile(r'^(?:\d{8}|[XYZ]\d{7})[A-Z]$')
+
+PERU_NONRESIDENT_ID_ERRORS = {
+    'short': "PersonalID is too short (minimum 5 characters)",
+    'long': "PersonalID is too long (maximum 20 characters)",
+    'invalid': "PersonalID contains invalid characters"
+}
+
+PERU_DOCUMENT_FIELDS = ('idcardno', 'passportid', 'DRIVERLICENSENO', 'personalid')
+PERU_MISSING_DOCUMENTS_ERROR = ("Non-residents must provide at least one document: "
+                                "ID card, passport, driver's license, or personal ID")
+
+@lru_cache(maxsize=CODE_CACHE_SIZE)
 def validate_peru_personalid(personalid, citizenship):
     """
     Validate Peru PersonalID based on citizenship
@@ -23,11 +40,8 @@ def validate_peru_personalid(personalid, citizenship):
         
         personalid = str(personalid).strip().upper()
         
-        if re.match(r'^\d{8}[A-Z]$', personalid):
-            return None  
-        
-        if re.match(r'^[XYZ]\d{7}[A-Z]$', personalid):
-            return None  
+        if SPANISH_ID_PATTERN.match(personalid):
+            return None
         
         return "Invalid Spanish ID format. Must be DNI (8 digits + letter) or NIE (X/Y/Z + 7 digits + letter)"
     
@@ -35,19 +49,7 @@ def validate_peru_personalid(personalid, citizenship):
         if personalid is None or personalid == '':
             return None  
         
-        personalid = str(personalid).strip()
-        
-
-        if len(personalid) < 5:
-            return "PersonalID is too short (minimum 5 characters)"
-        
-        if len(personalid) > 20:
-            return "PersonalID is too long (maximum 20 characters)"
-        
-        if not re.match(r'^[A-Za-z0-9\-\s]+$', personalid):
-            return "PersonalID contains invalid characters"
-        
-        return None  
+        return PERU_NONRESIDENT_ID_ERRORS.get(_id_shape_problem(str(personalid).strip()))
 
 def validate_peru_documents(row):
     """
@@ -68,23 +70,41 @@ def validate_peru_documents(row):
     if citizenship == 'ES':
         return None
     
-    documents = {
-        'idcardno': row.get('idcardno', ''),
-        'passportid': row.get('passportid', ''),
-        'DRIVERLICENSENO': row.get('DRIVERLICENSENO', ''),
-        'personalid': row.get('personalid', '') 
-    }
-    
-    provided_documents = []
-    for doc_name, doc_value in documents.items():
+    # One provided document is enough, so stop at the first
+    for doc_name in PERU_DOCUMENT_FIELDS:
+        doc_value = row.get(doc_name, '')
         if doc_value and str(doc_value).strip():
-            provided_documents.append(doc_name)
+            return None
+    
+    return PERU_MISSING_DOCUMENTS_ERROR
+
+def validate_peru_document_columns(columns, n_rows):
+    """
+    Column-wise validate_peru_documents
+    
+    Args:
+        columns: Dictionary of column name -> list of values (missing columns count as empty)
+        n_rows: Number of rows
+        
+    Returns:
+        List of (position, message) for the rows without any document
+    """
+    def column(name):
+        return pd.Series(columns.get(name, [''] * n_rows), dtype=object)
     
-    if not provided_documents:
-        return "Non-residents must provide at least one document: ID card, passport, driver's license, or personal ID"
+    citizenship = column('citizenship')
+    checked = ~citizenship.map(lambda value: value is None or value == '')
+    checked &= citizenship.astype(str).str.strip().str.upper() != 'ES'
     
-    return None  
+    provided = np.zeros(n_rows, dtype=bool)
+    for doc_name in PERU_DOCUMENT_FIELDS:
+        values = column(doc_name)
+        provided |= (values.astype(bool) & (values.astype(str).str.strip() != '')).to_numpy(dtype=bool)
+    
+    return [(position, PERU_MISSING_DOCUMENTS_ERROR)
+            for position in np.flatnonzero(checked.to_numpy(dtype=bool) & ~provided).tolist()]
 
+@lru_cache(maxsize=CODE_CACHE_SIZE)
 def validate_peru_zip(zip_code):
     """
     Validate Peru-specific zip code format
@@ -98,16 +118,15 @@ def validate_peru_zip(zip_code):
     if zip_code is None or zip_code == '':
         return "Zip code is empty"
     
-    zip_code = str(zip_code).strip()
+    zip_code = str(zip_code).strip().upper()
     
-
-    if re.match(r'^LIMA\d{2}$', zip_code.upper()):
-        return None  
-    
-    if re.match(r'^\d{5}$', zip_code):
-        return None  
+    # LIMAxx, 5 digits or 6 digits (isdecimal accepts exactly what \d matches)
+    if len(zip_code) in (5, 6) and zip_code.isdecimal():
+        return None
     
-    if re.match(r'^\d{6}$', zip_code):
-        return None  
+    if len(zip_code) == 6 and zip_code.startswith('LIMA') and zip_code[4:].isdecimal():
+        return None
     
     return "Peru zip code must be 5 digits, 6 digits, or LIMA format (LIMAxx)"
+
+register_cached_validators(validate_peru_personalid, validate_peru_zip)